@@ -1,23 +1,51 @@
+import logging
 import os
+import time
+import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Annotated, Union
+from typing import Annotated, Optional, Union
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from jwt import InvalidTokenError
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import get_db
-from model.user import User
+from common.token_cache import TokenCache
+from common.token_denylist import REVOKE, TokenDenylist
+from database import async_engine, get_db, run_after_commit, token_watcher
+from model.user import RevokedToken
 from schema.token import UserToken
+from service.repository import CrudRepository
+
+logger = logging.getLogger(__name__)
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = float(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+token_cache = TokenCache()
+token_denylist = TokenDenylist()
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    access token으로 인증된 사용자.
+    요청마다 ORM User를 만들지 않도록 token별로 하나를 만들어 공유하는 불변 객체
+    """
+
+    id: str
+    name: str
+    email: str
+    role: str
+    group_id: Optional[str] = None
+    # 로그아웃(폐기)에 사용하는 token 정보
+    jti: Optional[str] = None
+    exp: Optional[int] = None
 
 
 async def get_user(db: AsyncSession, email: str):
@@ -33,8 +61,14 @@ async def authenticate_user(
     user = await get_user(db, email)
     if not user:
         return False
-    if not user.verify_password(password):
+    # bcrypt 동안 connection(sqlite writer)을 잡고 있지 않도록 트랜잭션 종료
+    await db.commit()
+    current_hash = user._password
+    if not await user.check_password(password):
         return False
+    if user._password != current_hash:
+        # 새 hash는 별도의 짧은 트랜잭션으로 저장
+        await db.commit()
     return user
 
 
@@ -46,14 +80,30 @@ def create_access_token(
         expire = datetime.now(timezone.utc) + expires_delta
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
-):
+) -> Principal:
+    # 이미 검증한 token은 서명 확인 없이 반환 (exp가 지나면 다시 검증)
+    principal = token_cache.get(token)
+    if principal is None:
+        principal = _verify_token(token)
+        token_cache.put(token, principal.exp, principal)
+    # 로그아웃한 token 확인 (메모리 조회만 함)
+    if principal.jti is not None and principal.jti in token_denylist:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
+
+
+def _verify_token(token: str) -> Principal:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         token_data = UserToken(
@@ -71,10 +121,59 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     # 부하 문제로 user 조회를 제거
-    return User(
+    return Principal(
         id=token_data.id,
         name=token_data.name,
         email=token_data.email,
         role=token_data.role,
         group_id=token_data.group_id,
+        jti=payload.get("jti"),
+        exp=payload.get("exp"),
     )
+
+
+async def revoke_token(db: AsyncSession, principal: Principal):
+    """
+    token을 폐기합니다. (로그아웃)
+    DB에 저장(commit)한 뒤 이 worker의 denylist에 추가하고 다른 worker에
+    전파합니다. 다른 worker 전파는 POLICY_WATCHER(Redis)가 켜져 있을 때만
+    동작하며, 꺼져 있으면 다른 worker는 재시작할 때 DB에서 읽습니다.
+    jti가 없는 (이전에 발급한) token은 만료될 때까지 유효합니다.
+    """
+    if principal.jti is None or principal.exp is None:
+        return
+    # 같은 token으로 다시 로그아웃해도 (다른 worker 포함) 오류 없이 무시
+    await CrudRepository(db).upsert_many(
+        [RevokedToken(id=principal.jti, expires_at=principal.exp)]
+    )
+    await run_after_commit(
+        db, _token_revoked, [(principal.jti, principal.exp)]
+    )
+
+
+async def _token_revoked(entries):
+    token_denylist.add(entries)
+    if token_watcher is not None:
+        await token_watcher.publish(REVOKE, entries)
+
+
+async def load_revoked_tokens():
+    """
+    시작 시 만료된 폐기 token을 지우고, 남은 token으로 denylist를 다시 만듭니다.
+    """
+    if token_watcher is None:
+        logger.warning(
+            "POLICY_WATCHER is off: logout on another worker is applied "
+            "here only after restart"
+        )
+    now = int(time.time())
+    async with async_engine.begin() as conn:
+        await conn.execute(
+            delete(RevokedToken).where(RevokedToken.expires_at <= now)
+        )
+        result = await conn.execute(
+            select(RevokedToken.id, RevokedToken.expires_at).where(
+                RevokedToken.expires_at > now
+            )
+        )
+        token_denylist.load([tuple(row) for row in result])
@@ -0,0 +1,145 @@
+"""
+로그인 요청이 몰리는 동안 다른 API의 응답 시간을 측정합니다.
+- read: GET /boards (sqlite reader pool)
+- write: POST /comment (로그인과 같은 sqlite writer connection)
+- blocking: bcrypt를 event loop에서 실행 (변경 전)
+- pool: bcrypt를 전용 thread pool에서 실행
+
+    python -m benchmark.password_hash
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+PROBES = 200
+LOGIN_CONCURRENCY = 8
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+async def read(client, headers):
+    return await client.get("/boards?limit=2")
+
+
+async def write(client, headers):
+    return await client.post(
+        "/comment",
+        json={"related_id": "ideation_bench", "content": "bench"},
+        headers=headers,
+    )
+
+
+async def probe(client, request, headers, n=PROBES):
+    latencies = []
+    errors = 0
+    for _ in range(n):
+        started = time.perf_counter()
+        try:
+            response = await request(client, headers)
+            ok = response.status_code == 200
+        except Exception:  # pool timeout 등 500
+            ok = False
+        latencies.append((time.perf_counter() - started) * 1000)
+        errors += not ok
+    return latencies, errors
+
+
+async def login_storm(client, stop: asyncio.Event, counter: list):
+    while not stop.is_set():
+        try:
+            response = await client.post(
+                "/login",
+                data={"username": "admin@series0.com", "password": "12341234"},
+            )
+            assert response.status_code in (200, 503), response.text
+            counter.append(response.status_code)
+        except Exception:  # pool timeout 등 500
+            counter.append(500)
+
+
+async def measure(client, request, headers):
+    stop = asyncio.Event()
+    logins = []
+    storm = [
+        asyncio.create_task(login_storm(client, stop, logins))
+        for _ in range(LOGIN_CONCURRENCY)
+    ]
+    latencies, errors = await probe(client, request, headers)
+    stop.set()
+    await asyncio.gather(*storm)
+    return latencies, errors, logins.count(200)
+
+
+def report(name, latencies, errors, logins=None):
+    line = (
+        f"{name:<20} p50 {statistics.median(latencies):7.1f}ms  "
+        f"p99 {percentile(latencies, 99):7.1f}ms  "
+        f"max {max(latencies):7.1f}ms  errors {errors}"
+    )
+    if logins is not None:
+        line += f"  logins {logins}"
+    print(line)
+
+
+async def main():
+    import httpx
+
+    from database import init_db
+    from main import app
+    from mock import create_mock
+    from model.user import User
+
+    await init_db()
+    await create_mock()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        response = await client.post(
+            "/login",
+            data={"username": "admin@series0.com", "password": "12341234"},
+        )
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        check_password = User.check_password
+
+        async def blocking_check_password(self, plain_password):
+            return self.verify_password(plain_password)
+
+        for name, request in (("read", read), ("write", write)):
+            await probe(client, request, headers, 20)  # warm-up
+            report(f"{name}/idle", *await probe(client, request, headers))
+
+            User.check_password = blocking_check_password
+            try:
+                report(
+                    f"{name}/storm/block",
+                    *await measure(client, request, headers),
+                )
+            finally:
+                User.check_password = check_password
+            report(
+                f"{name}/storm/pool", *await measure(client, request, headers)
+            )
+
+
+if __name__ == "__main__":
+    db_dir = tempfile.mkdtemp()
+    os.environ["SQLALCHEMY_DATABASE_URL"] = (
+        f"sqlite+aiosqlite:///{db_dir}/bench.db"
+    )
+    # event loop가 막힌 시간까지 slow query로 기록되지 않도록
+    os.environ.setdefault("SLOW_QUERY_MS", "60000")
+    # writer connection을 기다리다 실패하는 요청을 확인하기 위해 짧게
+    os.environ.setdefault("SQLITE_WRITE_TIMEOUT", "1")
+    os.chdir(db_dir)
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+    asyncio.run(main())
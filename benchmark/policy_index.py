@@ -0,0 +1,61 @@
+"""
+정책 수에 따른 enforce 비용을 casbin matcher와 PolicyIndex로 비교합니다.
+casbin은 정책 목록 전체에 matcher를 평가하므로 정책 수에 비례하고,
+PolicyIndex는 hash 조회이므로 1M 정책에서도 일정합니다.
+
+    python -m benchmark.policy_index
+"""
+
+import time
+
+import casbin
+
+from common.config import ROOT_PATH
+from common.policy_index import PolicyIndex
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+# casbin은 정책 수에 비례하므로 1M은 측정하지 않음 (호출당 수 초)
+CASBIN_MAX_SIZE = 100_000
+
+
+def per_call_us(func, n):
+    started = time.perf_counter()
+    for _ in range(n):
+        func()
+    return (time.perf_counter() - started) / n * 1_000_000
+
+
+def main():
+    enforcer = casbin.Enforcer(f"{ROOT_PATH}/model.conf")
+    index = PolicyIndex(enforcer)
+    loaded = 0
+    print(f"{'policies':>10} {'casbin':>14} {'index':>10}")
+    for size in SIZES:
+        rules = [
+            [f"user_{i % 1000}", f"ideation_{i}", "write"]
+            for i in range(loaded, size)
+        ]
+        # model.add_policies는 중복 검사로 O(n^2)이므로 직접 추가
+        enforcer.get_model()["p"]["p"].policy.extend(rules)
+        loaded = size
+        index.load()
+
+        # 마지막에 추가된 정책 (casbin에서 가장 늦게 매칭되는 경우)
+        request = (
+            f"user_{(size - 1) % 1000}",
+            f"ideation_{size - 1}",
+            "write",
+        )
+        assert index.enforce(*request)
+        casbin_us = "-"
+        if size <= CASBIN_MAX_SIZE:
+            n = max(1, 100_000 // size)
+            casbin_us = (
+                f"{per_call_us(lambda: enforcer.enforce(*request), n):.1f}us"
+            )
+        index_us = per_call_us(lambda: index.enforce(*request), 100_000)
+        print(f"{size:>10} {casbin_us:>14} {index_us:>8.2f}us")
+
+
+if __name__ == "__main__":
+    main()
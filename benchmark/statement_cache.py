@@ -0,0 +1,126 @@
+"""
+statement 캐시 전후의 호출당 Python 측 오버헤드를 비교합니다.
+- build: select() 구성 + cache key 계산 (execute 시 매번 일어나는 작업)
+- execute: 메모리 sqlite에서 find_by_id / Ideation(detail) 조회 전체 호출
+
+Ideation(detail)은 관계 로딩(selectinload) 쿼리가 호출 시간(수 ms)을 대부분
+차지해서, build에서 줄인 100us 남짓은 실행마다의 편차(0.9x ~ 1.1x)에 묻힙니다.
+그래서 find_ideation_by_id는 statement 캐시를 쓰지 않습니다.
+
+    python -m benchmark.statement_cache
+"""
+
+import asyncio
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+N = 5000
+
+
+def per_call_us(func, n=N):
+    started = time.perf_counter()
+    for _ in range(n):
+        func()
+    return (time.perf_counter() - started) / n * 1_000_000
+
+
+async def async_per_call_us(func, n=N):
+    started = time.perf_counter()
+    for _ in range(n):
+        await func()
+    return (time.perf_counter() - started) / n * 1_000_000
+
+
+def report(name, before, after):
+    print(
+        f"{name:<28} before {before:8.1f}us  after {after:8.1f}us  "
+        f"({before / after:.1f}x)"
+    )
+
+
+async def main():
+    from database import Base
+    from model.board import Board, BoardCategory
+    from model.ideation import Ideation
+    from model.user import User  # noqa: F401 (relationship 대상 등록)
+    from service.loading import loading_options
+    from service.repository import CrudRepository
+    from service.statements import select_by
+
+    def build_board():
+        return select(Board).where(Board.id == "board_1")
+
+    def build_ideation():
+        return (
+            select(Ideation)
+            .options(*loading_options(Ideation, "detail"))
+            .where(Ideation.id == "ideation_1")
+        )
+
+    report(
+        "build Board by id",
+        per_call_us(lambda: build_board()._generate_cache_key()),
+        per_call_us(
+            lambda: select_by(Board, Board.id)._generate_cache_key()
+        ),
+    )
+    report(
+        "build Ideation(detail) by id",
+        per_call_us(lambda: build_ideation()._generate_cache_key()),
+        per_call_us(
+            lambda: select_by(
+                Ideation, Ideation.id, "detail"
+            )._generate_cache_key()
+        ),
+    )
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine) as db:
+        db.add(
+            Board(
+                id="board_1",
+                category=BoardCategory.NOTICE,
+                title="t",
+                content="c",
+            )
+        )
+        db.add(Ideation(id="ideation_1", title="t", content="c"))
+        await db.commit()
+        repo = CrudRepository(db)
+
+        async def find_board_uncached():
+            result = await db.execute(build_board())
+            return result.unique().scalar_one_or_none()
+
+        async def find_ideation_uncached():
+            result = await db.execute(build_ideation())
+            return result.unique().scalar_one_or_none()
+
+        async def find_ideation_cached():
+            result = await db.execute(
+                select_by(Ideation, Ideation.id, "detail"),
+                {"value": "ideation_1"},
+            )
+            return result.unique().scalar_one_or_none()
+
+        report(
+            "execute find_by_id",
+            await async_per_call_us(find_board_uncached),
+            await async_per_call_us(
+                lambda: repo.find_by_id(Board, "board_1")
+            ),
+        )
+        report(
+            "execute Ideation(detail)",
+            await async_per_call_us(find_ideation_uncached, N // 5),
+            await async_per_call_us(find_ideation_cached, N // 5),
+        )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import random
+import time
+
+from sqlalchemy import Delete, Insert, Select, Update
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+
+# 쓰기 후 이 시간 동안은 같은 사용자의 읽기를 primary로 보냄
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", 5))
+
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class RoutingSession(Session):
+    """
+    info["use_replica"]가 True이면 SELECT를 replica로 보내고,
+    flush와 INSERT/UPDATE/DELETE는 항상 primary(bind)로 보냅니다.
+    """
+
+    def __init__(self, replicas=(), **kwargs):
+        super().__init__(**kwargs)
+        # AsyncEngine이 넘어오면 sync engine으로 변환
+        self.replicas = [getattr(e, "sync_engine", e) for e in replicas]
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self.info["wrote"] = True
+        elif (
+            self.info.get("use_replica")
+            and self.replicas
+            and isinstance(clause, Select)
+        ):
+            return random.choice(self.replicas)
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+def db_route(target: str):
+    """
+    endpoint 단위로 읽기 대상을 지정합니다. ("primary" 또는 "replica")
+
+        @router.get("/ideation/user")
+        @db_route("primary")
+        async def get_ideation_by_user(...):
+    """
+    if target not in ("primary", "replica"):
+        raise ValueError(f"unknown db route: {target}")
+
+    def decorator(func):
+        func.db_route = target
+        return func
+
+    return decorator
+
+
+class ReadYourWrites:
+    """
+    방금 쓰기를 한 사용자의 읽기 요청을 일정 시간 primary로 고정합니다.
+    (워커 프로세스 단위로 유지)
+    """
+
+    def __init__(self, seconds: float = REPLICA_STICKY_SECONDS):
+        self.seconds = seconds
+        self._until = {}
+
+    def mark(self, key: str):
+        now = time.monotonic()
+        if len(self._until) > 10000:
+            self._until = {k: v for k, v in self._until.items() if v > now}
+        self._until[key] = now + self.seconds
+
+    def is_sticky(self, key: str) -> bool:
+        return self._until.get(key, 0) > time.monotonic()
+
+
+read_your_writes = ReadYourWrites()
+
+
+def client_key(request: Request) -> str:
+    identity = request.headers.get("authorization") or (
+        request.client.host if request.client else ""
+    )
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+def use_replica(request: Request) -> bool:
+    route = getattr(request.scope.get("endpoint"), "db_route", None)
+    if route is not None:
+        return route == "replica"
+    if request.method not in READ_METHODS:
+        return False
+    return not read_your_writes.is_sticky(client_key(request))
@@ -0,0 +1,308 @@
+import os
+from collections import OrderedDict
+
+from casbin_async_sqlalchemy_adapter import CasbinRule
+from sqlalchemy import Index, bindparam, select
+
+from common.policy_writer import ADD, REMOVE
+from common.role_links import MISSING, RoleLinks
+
+# model.conf matcher의 r.sub == "admin" 조건
+ADMIN_SUBJECT = "admin"
+# filtered 모드에서 정책을 캐시할 최대 subject 수
+POLICY_CACHE_SIZE = int(os.getenv("POLICY_CACHE_SIZE", 10000))
+# 다른 worker에 전파하는 User.group_id 변경 (rules = [(user_id,)])
+GROUP = "group"
+
+# filtered 모드의 subject별 조회용 인덱스
+policy_subject_index = Index(
+    "ix_casbin_rule_ptype_v0", CasbinRule.ptype, CasbinRule.v0
+)
+
+
+def as_rule(rule) -> tuple:
+    return tuple(rule[:3])
+
+
+class PolicyIndex:
+    """
+    casbin p 정책을 (sub, obj, act) hash set으로 들고 있는 enforce 캐시.
+    matcher를 정책 목록 전체에 대해 평가하지 않으므로 정책 수와 무관하게 O(1) 입니다.
+    정책 추가/삭제는 이 객체를 통해 enforcer와 index를 함께 갱신합니다.
+    writer(PolicyWriter)가 있으면 DB 저장은 background에서 batch로 합니다.
+    watcher(PolicyWatcher)가 있으면 저장된 변경을 다른 worker에 전파합니다.
+    subject가 속한 group의 정책도 적용합니다. (model.conf의 g(r.sub, p.sub))
+    """
+
+    def __init__(self, enforcer, writer=None, watcher=None):
+        self.enforcer = enforcer
+        self.writer = writer
+        self.watcher = watcher
+        self._rules = set()
+        self.links = RoleLinks()
+        if writer is not None and watcher is not None:
+            # write-behind에서는 DB에 저장된 뒤 전파
+            writer.on_flush = watcher.publish
+
+    def load(self):
+        """
+        enforcer.load_policy() 이후 전체 index를 다시 만듭니다.
+        """
+        self._rules = {as_rule(rule) for rule in self.enforcer.get_policy()}
+        self.links.load(
+            tuple(link[:2]) for link in self.enforcer.get_grouping_policy()
+        )
+
+    def group(self, sub):
+        """
+        캐시된 user의 group (User.group_id, 캐시에 없으면 MISSING)
+        """
+        return self.links.group(sub)
+
+    @property
+    def group_version(self) -> int:
+        return self.links.group_version
+
+    def set_group(self, sub, group_id, version=None):
+        """
+        DB에서 읽은 User.group_id를 캐시합니다. (이전 group은 대체)
+        version(읽기 전 group_version) 이후 group이 바뀌었으면 캐시하지 않습니다.
+        """
+        self.links.set_group(sub, group_id, version)
+
+    def forget_groups(self, subs):
+        """
+        User.group_id가 바뀐 사용자의 group 캐시를 지웁니다. (commit 이후에 호출)
+        """
+        self.links.forget_groups(subs)
+
+    async def publish_groups(self, subs):
+        if self.watcher is not None:
+            await self.watcher.publish(GROUP, [(sub,) for sub in subs])
+
+    async def group_changed(self, subs):
+        """
+        group 캐시를 지우고 다른 worker에 전파합니다.
+        """
+        subs = list(subs)
+        self.forget_groups(subs)
+        await self.publish_groups(subs)
+
+    def __len__(self):
+        return len(self._rules)
+
+    def enforce(self, sub, obj, act, group_id=MISSING) -> bool:
+        # m = (g(r.sub, p.sub) && r.obj == p.obj && r.act == p.act)
+        #     || (r.sub == "admin")
+        return sub == ADMIN_SUBJECT or any(
+            (role, obj, act) in self._rules
+            for role in self.links.roles(sub, group_id)
+        )
+
+    async def authorize(self, sub, obj, act, group_id=MISSING) -> bool:
+        """
+        필요하면 정책을 불러온 뒤 enforce 합니다. (filtered 모드와 같은 interface)
+        group_id: sub의 User.group_id (없으면 캐시된 group)
+        """
+        return self.enforce(sub, obj, act, group_id)
+
+    async def add_policies(self, rules) -> bool:
+        rules = [as_rule(rule) for rule in rules]
+        # enforcer는 이미 있는 정책이 하나라도 있으면 아무것도 추가하지 않음
+        # (writer가 있으면 auto save를 끄므로 메모리에만 추가)
+        added = await self.enforcer.add_policies(rules)
+        if added:
+            self._rules.update(rules)
+            await self._changed(ADD, rules)
+        return added
+
+    async def remove_policies(self, rules) -> bool:
+        rules = [as_rule(rule) for rule in rules]
+        removed = await self.enforcer.remove_policies(rules)
+        if removed:
+            self._rules.difference_update(rules)
+            await self._changed(REMOVE, rules)
+        return removed
+
+    async def _changed(self, op, rules):
+        if self.writer is not None:
+            self.writer.enqueue(op, rules)
+        elif self.watcher is not None:
+            await self.watcher.publish(op, rules)
+
+    def apply(self, op, rules):
+        """
+        다른 worker의 변경을 메모리에만 반영합니다. (저장, 전파하지 않음)
+        """
+        if op == GROUP:
+            # 다음 권한 확인 시 DB에서 다시 읽음
+            self.links.forget_groups(rule[0] for rule in rules)
+            return
+        rules = [as_rule(rule) for rule in rules]
+        model = self.enforcer.get_model()
+        if op == ADD:
+            model.add_policies_ex("p", "p", [list(rule) for rule in rules])
+            self._rules.update(rules)
+        else:
+            model.remove_policies_with_effected(
+                "p", "p", [list(rule) for rule in rules]
+            )
+            self._rules.difference_update(rules)
+
+
+class FilteredPolicyIndex(PolicyIndex):
+    """
+    시작 시 정책을 읽지 않고, subject별 정책을 처음 사용할 때 DB에서 읽어
+    LRU(최대 POLICY_CACHE_SIZE subject)에 보관합니다.
+    casbin_rule 크기와 무관하게 worker가 바로 시작하고 메모리도 제한됩니다.
+    enforcer model에는 정책을 올리지 않으므로 저장은 adapter에 직접 합니다.
+    """
+
+    def __init__(
+        self,
+        enforcer,
+        engine,
+        max_subjects=POLICY_CACHE_SIZE,
+        writer=None,
+        watcher=None,
+    ):
+        super().__init__(enforcer, writer, watcher)
+        self.engine = engine
+        self.max_subjects = max_subjects
+        self._subjects = OrderedDict()  # sub -> {(obj, act)}
+        # 읽는 도중 정책이 바뀌면 읽은 결과를 캐시하지 않기 위한 version
+        self._version = 0
+        self._statement = select(CasbinRule.v1, CasbinRule.v2).where(
+            CasbinRule.ptype == "p", CasbinRule.v0 == bindparam("sub")
+        )
+        self._linked = set()  # g 정책(상위 group)을 읽은 subject
+        self._links_statement = select(CasbinRule.v1).where(
+            CasbinRule.ptype == "g", CasbinRule.v0 == bindparam("sub")
+        )
+
+    def load(self):
+        self.invalidate()
+
+    def __len__(self):
+        return sum(len(rules) for rules in self._subjects.values())
+
+    def invalidate(self, sub=None):
+        """
+        sub의 캐시를 지웁니다. sub가 없으면 전체를 지웁니다.
+        다른 곳에서 정책이 바뀌었을 때 호출하면 다음 사용 시 다시 읽습니다.
+        """
+        self._version += 1
+        if sub is None:
+            self._subjects.clear()
+            self._linked.clear()
+            self.links.load(())
+        else:
+            self._subjects.pop(sub, None)
+            self._linked.discard(sub)
+
+    def enforce(self, sub, obj, act, group_id=MISSING) -> bool:
+        # 캐시된 subject만 판단합니다. 요청 처리에서는 authorize를 사용
+        return sub == ADMIN_SUBJECT or any(
+            (obj, act) in self._subjects.get(role, ())
+            for role in self.links.roles(sub, group_id)
+        )
+
+    async def authorize(self, sub, obj, act, group_id=MISSING) -> bool:
+        if sub == ADMIN_SUBJECT:
+            return True
+        for role in await self._load_roles(sub, group_id):
+            if (obj, act) in await self._load_subject(role):
+                return True
+        return False
+
+    async def _load_roles(self, sub, group_id=MISSING) -> frozenset:
+        # 상위 group을 아직 읽지 않은 subject의 g 정책을 따라가며 읽음
+        if len(self._linked) > self.max_subjects:
+            # g 정책만 다시 읽음 (user별 group 캐시는 유지)
+            self._linked.clear()
+            self.links.load(())
+        stack = [sub]
+        if group_id is MISSING:
+            group_id = self.links.group(sub)
+        if group_id not in (MISSING, None):
+            stack.append(group_id)
+        visited = set()
+        while stack:
+            node = stack.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            if node not in self._linked:
+                async with self.engine.connect() as conn:
+                    result = await conn.execute(
+                        self._links_statement, {"sub": node}
+                    )
+                    self.links.add(
+                        (node, parent) for parent in result.scalars()
+                    )
+                self._linked.add(node)
+            stack.extend(self.links.parents(node))
+        return frozenset(visited)
+
+    async def _load_subject(self, sub) -> set:
+        rules = self._subjects.get(sub)
+        if rules is not None:
+            self._subjects.move_to_end(sub)
+            return rules
+        version = self._version
+        # 읽기 전에 가져와야 읽는 중에 저장된 변경도 빠지지 않음
+        pending = self.writer.pending(sub) if self.writer is not None else ()
+        async with self.engine.connect() as conn:
+            result = await conn.execute(self._statement, {"sub": sub})
+            rules = {tuple(row) for row in result}
+        # 아직 저장되지 않은 변경을 순서대로 반영
+        for op, (_, obj, act) in pending:
+            if op == ADD:
+                rules.add((obj, act))
+            else:
+                rules.discard((obj, act))
+        if version != self._version:
+            return rules
+        self._subjects[sub] = rules
+        if len(self._subjects) > self.max_subjects:
+            self._subjects.popitem(last=False)
+        return rules
+
+    async def add_policies(self, rules) -> bool:
+        rules = [as_rule(rule) for rule in rules]
+        if self.writer is None:
+            await self.enforcer.adapter.add_policies("p", "p", rules)
+        self._update(rules, add=True)
+        await self._changed(ADD, rules)
+        return True
+
+    async def remove_policies(self, rules) -> bool:
+        rules = [as_rule(rule) for rule in rules]
+        removed = True
+        if self.writer is None:
+            removed = False
+            for rule in rules:
+                removed |= await self.enforcer.adapter.remove_policy(
+                    "p", "p", rule
+                )
+        self._update(rules, add=False)
+        await self._changed(REMOVE, rules)
+        return removed
+
+    def apply(self, op, rules):
+        if op == GROUP:
+            return super().apply(op, rules)
+        # 캐시에 없는 subject는 다음 사용 시 DB에서 읽음
+        self._update([as_rule(rule) for rule in rules], add=op == ADD)
+
+    def _update(self, rules, add: bool):
+        # 캐시에 없는 subject는 다음 사용 시 DB에서 최신 정책을 읽음
+        self._version += 1
+        for sub, obj, act in rules:
+            cached = self._subjects.get(sub)
+            if cached is None:
+                continue
+            if add:
+                cached.add((obj, act))
+            else:
+                cached.discard((obj, act))
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import logging
+import os
+import uuid
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+POLICY_CHANNEL = os.getenv("POLICY_CHANNEL", "casbin:policy")
+
+
+class RedisBus:
+    """
+    Redis pub/sub
+    """
+
+    def __init__(self, url: str):
+        # watcher를 사용할 때만 redis를 import
+        from redis import asyncio as redis
+
+        self.redis = redis.from_url(url, decode_responses=True)
+
+    async def publish(self, channel: str, data: str):
+        await self.redis.publish(channel, data)
+
+    async def subscribe(self, channel: str):
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(channel)
+        return self._messages(pubsub, channel)
+
+    async def _messages(self, pubsub, channel):
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield message["data"]
+        finally:
+            await pubsub.unsubscribe(channel)
+
+
+class LocalBus:
+    """
+    프로세스 안에서만 동작하는 pub/sub (테스트, 단일 worker용)
+    """
+
+    def __init__(self):
+        self._queues = defaultdict(list)
+
+    async def publish(self, channel: str, data: str):
+        for queue in self._queues[channel]:
+            queue.put_nowait(data)
+
+    async def subscribe(self, channel: str):
+        queue = asyncio.Queue()
+        self._queues[channel].append(queue)
+        return self._messages(queue, channel)
+
+    async def _messages(self, queue, channel):
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._queues[channel].remove(queue)
+
+
+class PolicyWatcher:
+    """
+    정책 변경분(delta)을 pub/sub으로 다른 worker에 전파합니다.
+    받은 worker는 전체 load_policy() 없이 변경된 정책만 메모리에 반영합니다.
+    자신이 보낸 메시지는 source로 구분해 무시합니다.
+    """
+
+    def __init__(self, bus, channel: str = POLICY_CHANNEL):
+        self.bus = bus
+        self.channel = channel
+        self.source = uuid.uuid4().hex
+        self._task = None
+
+    async def publish(self, op: str, rules):
+        message = {
+            "source": self.source,
+            "op": op,
+            "rules": [list(rule) for rule in rules],
+        }
+        try:
+            await self.bus.publish(
+                self.channel, json.dumps(message, ensure_ascii=False)
+            )
+        except Exception:
+            # 정책은 이미 저장되었으므로 요청은 실패시키지 않음
+            logger.exception("policy publish failed: %s", message)
+
+    async def start(self, apply):
+        """
+        apply(op, rules): 다른 worker의 변경을 반영하는 함수
+        구독이 끝난 뒤 반환하므로 이후 발행된 변경은 빠지지 않습니다.
+        """
+        if self._task is None:
+            messages = await self.bus.subscribe(self.channel)
+            self._task = asyncio.get_running_loop().create_task(
+                self._listen(messages, apply)
+            )
+
+    async def _listen(self, messages, apply):
+        try:
+            async for data in messages:
+                try:
+                    message = json.loads(data)
+                    if message["source"] != self.source:
+                        apply(message["op"], message["rules"])
+                except Exception:
+                    logger.exception("policy delta failed: %s", data)
+        except Exception:
+            # 이후 변경은 재시작(load_policy) 전까지 반영되지 않음
+            logger.exception("policy watcher stopped")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# background flush 주기 (초)
+POLICY_FLUSH_INTERVAL = float(os.getenv("POLICY_FLUSH_INTERVAL", 0.5))
+# 대기 중인 정책이 이 수를 넘으면 주기를 기다리지 않고 flush
+POLICY_FLUSH_BATCH = int(os.getenv("POLICY_FLUSH_BATCH", 500))
+
+ADD = "add"
+REMOVE = "remove"
+
+
+class PolicyWriter:
+    """
+    casbin 정책 insert/delete를 모아 두었다가 background task에서 batch로
+    저장합니다. (write-behind)
+    요청은 메모리의 enforcer/index만 갱신하고 DB 쓰기를 기다리지 않습니다.
+    저장에 성공한 정책만 대기열에서 빠지므로 flush가 실패해도 다음 flush에서
+    다시 시도하며, 종료 시 남은 정책을 모두 저장합니다.
+    """
+
+    def __init__(
+        self,
+        adapter,
+        interval: float = POLICY_FLUSH_INTERVAL,
+        batch_size: int = POLICY_FLUSH_BATCH,
+    ):
+        self.adapter = adapter
+        self.interval = interval
+        self.batch_size = batch_size
+        self.failures = 0
+        # 저장된 batch마다 호출 (op, rules) - 다른 worker에 전파
+        self.on_flush = None
+        self._pending = deque()  # (ADD | REMOVE, rule)
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task = None
+        self._stopping = False
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, rules):
+        self.enqueue(ADD, rules)
+
+    def remove(self, rules):
+        self.enqueue(REMOVE, rules)
+
+    def enqueue(self, op, rules):
+        self._pending.extend((op, tuple(rule)) for rule in rules)
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def pending(self, sub) -> list:
+        """
+        아직 저장되지 않은 sub의 변경 [(ADD | REMOVE, rule)] (대기열 순서)
+        """
+        return [(op, rule) for op, rule in self._pending if rule[0] == sub]
+
+    async def flush(self) -> int:
+        """
+        대기 중인 정책을 순서대로 저장하고 저장한 수를 반환합니다.
+        연속된 같은 종류의 변경을 batch_size 단위로 묶어 저장합니다.
+        """
+        flushed = 0
+        async with self._lock:
+            while self._pending:
+                op = self._pending[0][0]
+                rules = []
+                for item_op, rule in self._pending:
+                    if item_op != op or len(rules) >= self.batch_size:
+                        break
+                    rules.append(rule)
+
+                if op == ADD:
+                    await self.adapter.add_policies("p", "p", rules)
+                else:
+                    # 이미 삭제된 정책은 무시되므로 재시도해도 안전
+                    for rule in rules:
+                        await self.adapter.remove_policy("p", "p", rule)
+
+                # 저장이 끝난 뒤에만 대기열에서 제거
+                for _ in rules:
+                    self._pending.popleft()
+                flushed += len(rules)
+                if self.on_flush is not None:
+                    await self.on_flush(op, rules)
+        return flushed
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                self.failures += 1
+                logger.exception(
+                    "policy flush failed, %d pending", len(self._pending)
+                )
+
+    async def stop(self):
+        """
+        background task를 멈추고 남은 정책을 저장합니다. (종료 시)
+        저장에 실패하면 저장하지 못한 정책을 로그로 남기고 예외를 다시 던집니다.
+        """
+        if self._task is not None:
+            # flush 도중 취소하지 않도록 현재 flush가 끝날 때까지 기다림
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.error(
+                "policy flush failed on shutdown, unsaved: %s",
+                json.dumps(list(self._pending), ensure_ascii=False),
+            )
+            raise
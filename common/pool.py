@@ -0,0 +1,121 @@
+import asyncio
+import os
+import time
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+# connection을 기다리는 최대 시간 (초)
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+# checkout 시 connection이 살아있는지 확인 (끊긴 connection 재사용 방지)
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+# 이 시간(초)보다 오래된 connection은 재생성, -1이면 사용하지 않음
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", -1))
+
+
+class PoolStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.wait_total = 0.0  # 초 단위
+        self.wait_max = 0.0
+
+    def record(self, elapsed: float):
+        self.checkouts += 1
+        self.wait_total += elapsed
+        self.wait_max = max(self.wait_max, elapsed)
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """
+    checkout 대기 시간(connection 생성 포함)을 기록하는 pool.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            self.stats.record(time.perf_counter() - started)
+
+    def recreate(self):
+        # engine.dispose() 후에도 누적 통계 유지
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def engine_options(url: str, **overrides) -> dict:
+    """
+    create_async_engine에 넘길 pool 설정을 반환합니다.
+    메모리 sqlite는 connection 하나를 공유하므로 기본 pool을 사용합니다.
+    """
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite" and url.database in (
+        None,
+        "",
+        ":memory:",
+    ):
+        return {}
+    options = {
+        "poolclass": MeteredQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+    options.update(overrides)
+    return options
+
+
+def pool_status(engine: AsyncEngine) -> dict:
+    pool = engine.pool
+    status = {"class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # 아직 pool_size만큼 만들지 않았으면 음수
+            overflow=max(pool.overflow(), 0),
+        )
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(
+            checkouts=stats.checkouts,
+            wait_avg_ms=round(
+                (
+                    stats.wait_total / stats.checkouts * 1000
+                    if stats.checkouts
+                    else 0.0
+                ),
+                3,
+            ),
+            wait_max_ms=round(stats.wait_max * 1000, 3),
+        )
+    return status
+
+
+async def warm_up(engine: AsyncEngine):
+    """
+    pool_size만큼 connection을 미리 만들어 둡니다.
+    배포 직후 첫 요청들이 connection 생성 비용을 내지 않도록 lifespan에서 호출합니다.
+    """
+    pool = engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return
+    count = pool.size() - pool.checkedin() - pool.checkedout()
+    if count <= 0:
+        return
+    connections = await asyncio.gather(
+        *[engine.connect() for _ in range(count)]
+    )
+    for conn in connections:
+        await conn.close()
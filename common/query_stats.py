@@ -0,0 +1,149 @@
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from starlette.requests import Request
+
+logger = logging.getLogger(__name__)
+
+# 한 요청에서 같은 형태의 쿼리가 이 횟수를 넘으면 N+1 경고
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", 5))
+
+_PARAM = r"\s*(?:\?|\$\d+|%\(\w+\)s)\s*"  # sqlite, asyncpg, psycopg
+_IN_PARAMS = re.compile(rf"\((?:{_PARAM},)+{_PARAM}\)")
+
+
+class QueryStats:
+    def __init__(self, route: str = ""):
+        self.route = route
+        self.count = 0
+        self.total_time = 0.0  # 초 단위
+        self.shapes = Counter()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD):
+        return {
+            shape: count
+            for shape, count in self.shapes.items()
+            if count > threshold
+        }
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.total_time * 1000:.2f};desc="{self.count} queries"'
+        )
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "query_stats", default=None
+)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def statement_shape(statement: str) -> str:
+    # IN (?, ?, ?) 처럼 파라미터 개수만 다른 쿼리는 같은 형태로 취급
+    return _IN_PARAMS.sub("(?)", " ".join(statement.split()))
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    # 실행(context)별 시작 시각 - 실패한 쿼리가 남아도 다른 쿼리와 섞이지 않음
+    conn.info.setdefault("query_start_time", {})[context] = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    started = conn.info["query_start_time"].pop(context)
+    elapsed = time.perf_counter() - started
+    if context is not None:
+        # 같은 실행의 다른 listener(SlowQueryLog)는 다시 재지 않고 이 값을 사용
+        context.query_elapsed = elapsed
+    stats = current_stats()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def _handle_error(exception_context):
+    # 실패한 쿼리는 after_cursor_execute가 호출되지 않음
+    conn = exception_context.connection
+    if conn is not None:
+        conn.info.get("query_start_time", {}).pop(
+            exception_context.execution_context, None
+        )
+
+
+def query_elapsed(context) -> Optional[float]:
+    """
+    after_cursor_execute에서 잰 실행 시간(초), 측정하지 않았으면 None
+    """
+    return getattr(context, "query_elapsed", None)
+
+
+def is_instrumented(target) -> bool:
+    return event.contains(
+        target, "before_cursor_execute", _before_cursor_execute
+    )
+
+
+def instrument(target):
+    """
+    sync Engine(또는 Connection)에 쿼리 측정 이벤트를 등록합니다.
+    AsyncEngine은 async_engine.sync_engine을 넘겨야 합니다.
+    """
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+    # handle_error는 Engine에만 등록할 수 있음 (Engine.engine은 자기 자신)
+    event.listen(target.engine, "handle_error", _handle_error)
+
+
+def uninstrument(target):
+    event.remove(target, "before_cursor_execute", _before_cursor_execute)
+    event.remove(target, "after_cursor_execute", _after_cursor_execute)
+    event.remove(target.engine, "handle_error", _handle_error)
+
+
+def warn_repeated(stats: QueryStats):
+    for shape, count in stats.repeated().items():
+        logger.warning(
+            "possible N+1 in %s (%d times): %s", stats.route, count, shape
+        )
+
+
+@contextmanager
+def track_queries(route: str = ""):
+    """
+    블록 안에서 실행된 쿼리를 QueryStats에 기록합니다.
+    블록이 끝나면 반복된 쿼리(N+1 의심)를 경고로 남깁니다.
+    """
+    stats = QueryStats(route)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+        warn_repeated(stats)
+
+
+async def query_stats_middleware(request: Request, call_next):
+    """
+    요청별 쿼리 수와 DB 시간을 Server-Timing 헤더로 노출합니다.
+    """
+    with track_queries(f"{request.method} {request.url.path}") as stats:
+        response = await call_next(request)
+        response.headers["Server-Timing"] = stats.server_timing()
+        return response
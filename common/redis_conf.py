@@ -1,10 +1,9 @@
 import os
 
-import aioredis
+from redis import asyncio as redis
 
 REDIS_URL = os.getenv("REDIS_URL")
 
 
 async def get_redis():
-    redis = aioredis.from_url(REDIS_URL, decode_responses=True)
-    return redis
+    return redis.from_url(REDIS_URL, decode_responses=True)
@@ -0,0 +1,108 @@
+import os
+from collections import OrderedDict
+
+# transitive closure, user별 group을 캐시할 최대 subject 수
+ROLE_CACHE_SIZE = int(os.getenv("ROLE_CACHE_SIZE", 10000))
+
+# group 캐시에 없는 사용자 (None은 group이 없는 사용자)
+MISSING = object()
+
+
+class RoleLinks:
+    """
+    casbin g(child, parent) 관계와 subject별 transitive closure 캐시.
+    - user -> group: User.group_id (user당 하나, LRU로 캐시)
+    - group -> 상위 group: casbin g 정책
+    roles(sub)는 sub 자신과 sub가 속한 모든 group을 반환합니다.
+    g 관계가 바뀌면 closure 캐시를 모두 지웁니다. (관계 변경은 드묾)
+    """
+
+    def __init__(self, max_subjects=ROLE_CACHE_SIZE):
+        self.max_subjects = max_subjects
+        self._parents = {}  # child -> {parent} (g 정책)
+        self._groups = OrderedDict()  # user -> group_id | None
+        self._closure = {}  # sub -> frozenset(sub, 상위 group ...) (g 정책)
+        # DB에서 group을 읽는 도중 바뀌면 읽은 값을 캐시하지 않기 위한 version
+        self.group_version = 0
+
+    def load(self, links):
+        """
+        g 정책을 다시 읽습니다. user별 group 캐시는 유지합니다.
+        """
+        self._parents = {}
+        self._closure.clear()
+        self.add(links)
+
+    def add(self, links) -> bool:
+        changed = False
+        for child, parent in links:
+            parents = self._parents.setdefault(child, set())
+            if parent not in parents:
+                parents.add(parent)
+                changed = True
+        if changed:
+            self._closure.clear()
+        return changed
+
+    def remove(self, links) -> bool:
+        changed = False
+        for child, parent in links:
+            parents = self._parents.get(child)
+            if parents and parent in parents:
+                parents.discard(parent)
+                changed = True
+        if changed:
+            self._closure.clear()
+        return changed
+
+    def group(self, sub):
+        """
+        캐시된 sub의 group (없으면 MISSING)
+        """
+        group_id = self._groups.get(sub, MISSING)
+        if group_id is not MISSING:
+            self._groups.move_to_end(sub)
+        return group_id
+
+    def set_group(self, sub, group_id, version=None):
+        # 이전 group을 대체 (user는 group 하나에만 속함)
+        if version is not None and version != self.group_version:
+            return
+        self._groups[sub] = group_id
+        self._groups.move_to_end(sub)
+        if len(self._groups) > self.max_subjects:
+            self._groups.popitem(last=False)
+
+    def forget_groups(self, subs):
+        self.group_version += 1
+        for sub in subs:
+            self._groups.pop(sub, None)
+
+    def parents(self, sub) -> set:
+        return self._parents.get(sub, set())
+
+    def roles(self, sub, group_id=MISSING) -> frozenset:
+        """
+        group_id가 없으면 캐시된 group을 사용합니다.
+        """
+        if group_id is MISSING:
+            group_id = self._groups.get(sub)
+        roles = self._ancestors(sub)
+        if group_id:
+            roles = roles | self._ancestors(group_id)
+        return roles
+
+    def _ancestors(self, sub) -> frozenset:
+        roles = self._closure.get(sub)
+        if roles is None:
+            found = {sub}
+            stack = [sub]
+            while stack:
+                for parent in self._parents.get(stack.pop(), ()):
+                    if parent not in found:
+                        found.add(parent)
+                        stack.append(parent)
+            if len(self._closure) >= self.max_subjects:
+                self._closure.clear()
+            roles = self._closure[sub] = frozenset(found)
+        return roles
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from common import query_stats
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 200))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+
+EXPLAIN_PREFIX = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+}
+_SKIP_OPTION = "skip_slow_query_log"
+
+
+class SlowQueryLog:
+    """
+    threshold_ms를 넘긴 쿼리를 파라미터, 실행 시간, 요청 route와 함께 기록합니다.
+    SELECT/UPDATE/DELETE는 별도 connection에서 실행 계획을 함께 남깁니다.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        threshold_ms: float = SLOW_QUERY_MS,
+        explain: bool = SLOW_QUERY_EXPLAIN,
+        maxlen: int = 100,
+        explain_engine: AsyncEngine = None,
+    ):
+        self.engine = engine
+        self.explain_engine = explain_engine or engine
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.recent = deque(maxlen=maxlen)  # 최근 slow query 기록
+        self._tasks = set()
+        self._instrumented = False
+
+    def install(self):
+        target = self.engine.sync_engine
+        # 실행 시간은 query_stats에서 한 번만 잼
+        # (query_stats listener가 이 listener보다 먼저 등록되어야 함)
+        self._instrumented = not query_stats.is_instrumented(target)
+        if self._instrumented:
+            query_stats.instrument(target)
+        event.listen(target, "after_cursor_execute", self._after)
+
+    def uninstall(self):
+        target = self.engine.sync_engine
+        event.remove(target, "after_cursor_execute", self._after)
+        if self._instrumented:
+            query_stats.uninstrument(target)
+            self._instrumented = False
+
+    def _after(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        elapsed = query_stats.query_elapsed(context)
+        if elapsed is None:
+            return
+        duration_ms = elapsed * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        if context is not None and context.execution_options.get(_SKIP_OPTION):
+            return
+
+        stats = query_stats.current_stats()
+        record = {
+            "route": stats.route if stats else None,
+            "duration_ms": round(duration_ms, 2),
+            "statement": statement,
+            "parameters": parameters,
+        }
+        prefix = EXPLAIN_PREFIX.get(conn.dialect.name)
+        if (
+            self.explain
+            and prefix
+            and not executemany
+            and _explainable(statement)
+        ):
+            # 요청 connection을 막지 않도록 별도 connection에서 비동기로 실행
+            task = asyncio.get_running_loop().create_task(
+                self._explain(record, prefix)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            self._emit(record)
+
+    async def _explain(self, record, prefix):
+        try:
+            async with self.explain_engine.connect() as conn:
+                conn = await conn.execution_options(**{_SKIP_OPTION: True})
+                result = await conn.exec_driver_sql(
+                    prefix + record["statement"], record["parameters"]
+                )
+                record["plan"] = [list(row) for row in result.all()]
+        except Exception as e:
+            record["plan_error"] = str(e)
+        self._emit(record)
+
+    def _emit(self, record):
+        self.recent.append(record)
+        logger.warning(
+            "slow query: %s",
+            json.dumps(record, ensure_ascii=False, default=str),
+        )
+
+    async def drain(self):
+        """
+        진행 중인 실행 계획 수집을 기다립니다. (종료 시, 테스트용)
+        """
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+def _explainable(statement: str) -> bool:
+    keyword = statement.lstrip().split(None, 1)[0].upper()
+    return keyword in ("SELECT", "UPDATE", "DELETE", "WITH")
@@ -0,0 +1,75 @@
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from common.pool import engine_options
+
+# 파일 sqlite를 사용할 때 WAL + writer 1개 / reader pool 구성을 적용
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "true").lower() == "true"
+SQLITE_READERS = int(os.getenv("SQLITE_READERS", 4))
+# writer connection을 기다리는 최대 시간 (초)
+SQLITE_WRITE_TIMEOUT = float(os.getenv("SQLITE_WRITE_TIMEOUT", 30))
+
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+    # 음수는 KiB 단위 (기본 64MB)
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", -64000)),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+}
+
+
+def is_file_sqlite(url: str) -> bool:
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database not in (
+        None,
+        "",
+        ":memory:",
+    )
+
+
+def set_pragmas(engine: AsyncEngine, **extra):
+    """
+    connection이 만들어질 때마다 PRAGMA를 설정합니다.
+    """
+    pragmas = {**PRAGMAS, **extra}
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
+
+def create_sqlite_engines(url: str, **kwargs):
+    """
+    (writer, reader) engine을 반환합니다.
+    - writer: connection 1개짜리 pool. 쓰기 트랜잭션은 pool checkout 대기열에서
+      순서대로 하나씩 실행되므로 "database is locked"가 발생하지 않습니다.
+    - reader: WAL에서는 쓰기 중에도 읽을 수 있으므로 여러 connection을 병렬로 사용.
+      query_only로 실수로 쓰는 것을 막습니다.
+    """
+    writer = create_async_engine(
+        url,
+        **engine_options(
+            url,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=SQLITE_WRITE_TIMEOUT,
+        ),
+        **kwargs,
+    )
+    reader = create_async_engine(
+        url,
+        **engine_options(url, pool_size=SQLITE_READERS, max_overflow=0),
+        **kwargs,
+    )
+    set_pragmas(writer)
+    set_pragmas(reader, query_only="ON")
+    return writer, reader
@@ -0,0 +1,50 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+
+# 검증한 access token을 캐시할 최대 수
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+
+
+def token_digest(token: str) -> bytes:
+    # token 원문을 메모리 key로 들고 있지 않도록 digest 사용
+    return hashlib.sha256(token.encode()).digest()
+
+
+class TokenCache:
+    """
+    서명과 claim을 검증한 token -> principal LRU 캐시.
+    token의 exp가 지나면 캐시에서도 만료되어 다시 검증(= 만료 오류)합니다.
+    """
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # digest -> (exp, principal)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, token: str):
+        key = token_digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        exp, principal = entry
+        if exp <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return principal
+
+    def put(self, token: str, exp, principal):
+        if exp is None:  # 만료 시각이 없는 token은 캐시하지 않음
+            return
+        key = token_digest(token)
+        self._entries[key] = (exp, principal)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
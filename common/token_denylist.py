@@ -0,0 +1,59 @@
+import os
+import time
+
+# 로그아웃한 token 전파 채널
+TOKEN_CHANNEL = os.getenv("TOKEN_CHANNEL", "auth:revoked")
+# 만료된 jti를 메모리에서 정리하는 주기 (초)
+TOKEN_PRUNE_INTERVAL = float(os.getenv("TOKEN_PRUNE_INTERVAL", 60))
+
+REVOKE = "revoke"
+
+
+class TokenDenylist:
+    """
+    로그아웃(폐기)한 access token의 jti -> exp.
+    요청마다 DB/Redis를 조회하지 않도록 프로세스 메모리에 두고
+    시작 시 DB(RevokedToken)에서 다시 읽으며, 다른 worker의 로그아웃은
+    watcher로 받아 반영합니다.
+    token은 exp가 지나면 어차피 거부되므로 만료된 jti는 메모리에서 제거합니다.
+    """
+
+    def __init__(self, prune_interval: float = TOKEN_PRUNE_INTERVAL):
+        self.prune_interval = prune_interval
+        self._revoked = {}  # jti -> exp
+        self._next_prune = 0
+
+    def __len__(self):
+        return len(self._revoked)
+
+    def __contains__(self, jti) -> bool:
+        return jti in self._revoked
+
+    def load(self, entries):
+        self._revoked = {}
+        self.add(entries)
+
+    def add(self, entries):
+        """
+        entries: [(jti, exp)]
+        """
+        now = time.time()
+        for jti, exp in entries:
+            if exp > now:
+                self._revoked[jti] = exp
+        if now >= self._next_prune:
+            self.prune(now)
+
+    def prune(self, now: float = None):
+        now = time.time() if now is None else now
+        self._revoked = {
+            jti: exp for jti, exp in self._revoked.items() if exp > now
+        }
+        self._next_prune = now + self.prune_interval
+
+    def apply(self, op: str, entries):
+        """
+        watcher로 받은 다른 worker의 로그아웃 반영
+        """
+        if op == REVOKE:
+            self.add(entries)
@@ -1,5 +1,4 @@
 import os
-import uuid
 from datetime import datetime
 
 import casbin
@@ -10,48 +9,174 @@ from sqlalchemy import Column, DateTime, String, event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import as_declarative, declared_attr
 from sqlalchemy.orm import configure_mappers, sessionmaker
+from starlette.requests import Request
 
+from common import query_stats
 from common.config import ROOT_PATH
+from common.db_routing import (RoutingSession, client_key, read_your_writes,
+                               use_replica)
+from common.policy_index import (FilteredPolicyIndex, PolicyIndex,
+                                 policy_subject_index)
+from common.policy_watcher import PolicyWatcher, RedisBus
+from common.policy_writer import PolicyWriter
+from common.pool import engine_options
+from common.slow_query import SlowQueryLog
+from common.sqlite_profile import (SQLITE_PROFILE, create_sqlite_engines,
+                                   is_file_sqlite)
+from common.token_denylist import TOKEN_CHANNEL
+from utils.id_util import uuid7
 
 load_dotenv()
 
 SQLALCHEMY_DATABASE_URL = os.getenv("SQLALCHEMY_DATABASE_URL")
+# 읽기 전용 replica (쉼표로 구분)
+SQLALCHEMY_REPLICA_URLS = [
+    url
+    for url in os.getenv("SQLALCHEMY_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+# true이면 repository는 flush만 하고 요청 종료 시 한 번만 commit
+UNIT_OF_WORK = os.getenv("UNIT_OF_WORK", "false").lower() == "true"
+# 전체 쿼리 로그 (느린 쿼리는 SLOW_QUERY_MS 기준으로 별도 기록)
+SQL_ECHO = os.getenv("SQL_ECHO", "false").lower() == "true"
+# true이면 시작 시 전체 정책을 읽지 않고 subject별로 필요할 때 읽음
+CASBIN_FILTERED = os.getenv("CASBIN_FILTERED", "false").lower() == "true"
+# true이면 정책 저장을 요청 안에서 하지 않고 background에서 batch로 저장
+POLICY_WRITE_BEHIND = (
+    os.getenv("POLICY_WRITE_BEHIND", "false").lower() == "true"
+)
+# true이면 정책 변경과 로그아웃을 Redis pub/sub으로 다른 worker에 전파
+# (worker 여러 개일 때)
+POLICY_WATCHER = os.getenv("POLICY_WATCHER", "false").lower() == "true"
 KST = pytz.timezone("Asia/Seoul")
 
-async_engine = create_async_engine(SQLALCHEMY_DATABASE_URL, echo=True)
-adapter = casbin_async_sqlalchemy_adapter.Adapter(SQLALCHEMY_DATABASE_URL)
+if SQLITE_PROFILE and is_file_sqlite(SQLALCHEMY_DATABASE_URL):
+    # 쓰기는 writer connection 하나로 직렬화하고, 읽기는 reader pool에서 병렬로
+    async_engine, reader_engine = create_sqlite_engines(
+        SQLALCHEMY_DATABASE_URL, echo=SQL_ECHO
+    )
+    replica_engines = [reader_engine]
+    # casbin 정책 저장도 같은 writer connection으로 직렬화
+    # (별도 engine이면 writer pool 밖에서 같은 파일에 쓰게 됨)
+    casbin_engine = async_engine
+    # 정책 조회는 writer를 기다리지 않도록 reader에서
+    casbin_reader = reader_engine
+else:
+    async_engine = create_async_engine(
+        SQLALCHEMY_DATABASE_URL,
+        echo=SQL_ECHO,
+        **engine_options(SQLALCHEMY_DATABASE_URL),
+    )
+    replica_engines = [
+        create_async_engine(
+            url.strip(), echo=SQL_ECHO, **engine_options(url.strip())
+        )
+        for url in SQLALCHEMY_REPLICA_URLS
+    ]
+    casbin_engine = create_async_engine(
+        SQLALCHEMY_DATABASE_URL,
+        **engine_options(SQLALCHEMY_DATABASE_URL, pool_size=1),
+    )
+    casbin_reader = casbin_engine
+# pool 상태 조회, warm-up 대상
+engines = {"primary": async_engine}
+engines.update(
+    {f"replica_{i}": engine for i, engine in enumerate(replica_engines)}
+)
+slow_query_logs = []
+for engine in [async_engine, *replica_engines]:
+    query_stats.instrument(engine.sync_engine)
+    # 실행 계획은 replica에서 수집 (sqlite writer connection을 점유하지 않도록)
+    slow_query_logs.append(
+        SlowQueryLog(engine, explain_engine=(replica_engines or [engine])[0])
+    )
+    slow_query_logs[-1].install()
+adapter = casbin_async_sqlalchemy_adapter.Adapter(casbin_engine)
 enforcer = casbin.AsyncEnforcer(f"{ROOT_PATH}/model.conf", adapter)
+policy_writer = PolicyWriter(adapter) if POLICY_WRITE_BEHIND else None
+policy_watcher = token_watcher = None
+if POLICY_WATCHER:
+    from common.redis_conf import REDIS_URL
+
+    redis_bus = RedisBus(REDIS_URL)
+    policy_watcher = PolicyWatcher(redis_bus)
+    token_watcher = PolicyWatcher(redis_bus, channel=TOKEN_CHANNEL)
+# 권한 확인/정책 추가는 enforcer 대신 policy_index를 사용
+if CASBIN_FILTERED:
+    policy_index = FilteredPolicyIndex(
+        enforcer, casbin_reader, writer=policy_writer, watcher=policy_watcher
+    )
+else:
+    policy_index = PolicyIndex(
+        enforcer, writer=policy_writer, watcher=policy_watcher
+    )
 
 AsyncSessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=async_engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    replicas=replica_engines,
     expire_on_commit=False,
+    info={"unit_of_work": UNIT_OF_WORK},
 )
 
 
-async def get_db():
+async def get_db(request: Request):
     async with AsyncSessionLocal() as session:
+        session.info["use_replica"] = use_replica(request)
         try:
             yield session
             await session.commit()
         except Exception as e:
             await session.rollback()
             raise e
+        if session.info.get("wrote"):
+            # 쓰기 직후 같은 사용자의 읽기는 primary에서 (read-your-writes)
+            read_your_writes.mark(client_key(request))
+        for func, args in session.info.pop("after_commit", []):
+            await func(*args)
+
+
+async def run_after_commit(db: AsyncSession, func, *args):
+    """
+    unit of work 모드에서는 요청의 commit 이후로 실행을 미룹니다.
+    (예: casbin 정책 저장이 같은 sqlite 파일의 쓰기 트랜잭션과 충돌하지 않도록)
+    """
+    if db.info.get("unit_of_work"):
+        db.info.setdefault("after_commit", []).append((func, args))
+    else:
+        await func(*args)
 
 
 async def init_enforcer():
     await adapter.create_table()
-    await enforcer.load_policy()
-    enforcer.enable_auto_save(True)
+    async with casbin_engine.begin() as conn:
+        await conn.run_sync(policy_subject_index.create, checkfirst=True)
+    if not CASBIN_FILTERED:
+        await enforcer.load_policy()
+    # write-behind 모드에서는 policy_writer가 저장
+    enforcer.enable_auto_save(policy_writer is None)
+    policy_index.load()
 
 
 async def init_db():
     configure_mappers()
-    await init_enforcer()
     async with async_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_indexes)
+    await init_enforcer()
+
+
+def create_indexes(connection):
+    """
+    create_all은 이미 존재하는 테이블의 인덱스를 만들지 않으므로
+    기존 DB에 새로 추가된 인덱스를 생성합니다.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
 
 
 @as_declarative()
@@ -83,10 +208,15 @@ class Base:
             )
 
 
+def generate_id(table_name: str) -> str:
+    # uuid7은 시간 순으로 정렬되므로 id 인덱스에 순차적으로 삽입됨
+    return f"{table_name}_{uuid7()}"
+
+
 @event.listens_for(Base, "before_insert", propagate=True)
 def before_insert(mapper, connection, target):
     # FIXME context로 유저 정보 주입
     # https://medium.com/wantedjobs/fastapi%EC%97%90%EC%84%9C-sqlalchemy-session-%EB%8B%A4%EB%A3%A8%EB%8A%94-%EB%B0%A9%EB%B2%95-118150b87efa
     table_name = target.__tablename__
     if not target.id:
-        target.id = f"{table_name}_{uuid.uuid4()}"
+        target.id = generate_id(table_name)
@@ -1,5 +1,5 @@
 import os.path
-from typing import List
+from typing import Optional
 
 from fastapi import APIRouter, Depends, UploadFile, File, Request
 from sqlalchemy import and_
@@ -7,12 +7,12 @@ from starlette import status
 from starlette.exceptions import HTTPException
 from starlette.responses import FileResponse
 
-from auth import get_current_user
-from database import enforcer
+from auth import Principal, get_current_user
 from model.attachment import Attachment, Comment, Image
-from model.user import User
 from schema.attachment import (CommentRequest,
                                CommentResponse, AttachmentResponse)
+from schema.page import Page
+from service.authorization import can_write
 from service.repository import CrudRepository, get_repository
 from utils.path_util import save_file, save_image, get_file_path
 
@@ -76,31 +76,35 @@ async def delete_image(
     await repo.delete(Image(id=id))
 
 
-@router.get("/comment/{id}", response_model=List[CommentResponse])
+@router.get("/comment/{id}", response_model=Page[CommentResponse])
 async def get_comments(
         id: str,
+        offset: int = 0,
+        limit: int = 10,
+        cursor: Optional[str] = None,
         repo: CrudRepository = Depends(get_repository),
 ):
-    comments = await repo.fetch_all(Comment, clauses=and_(Comment.related_id == id))
-    return [CommentResponse.model_validate(c) for c in comments]
+    comments, total, next_cursor = await repo.fetch_page(
+        Comment, offset, limit, and_(Comment.related_id == id), cursor
+    )
+    return Page(
+        items=[CommentResponse.model_validate(c) for c in comments],
+        total=total,
+        next_cursor=next_cursor,
+    )
 
 
 @router.post("/comment", response_model=CommentResponse)
 async def create_comment(
         comment: CommentRequest,
         repo: CrudRepository = Depends(get_repository),
-        current_user: User = Depends(get_current_user),
+        current_user: Principal = Depends(get_current_user),
 ):
     comment = Comment(
         **comment.dict(),
         user_id=current_user.id,
     )
     comment = await repo.create(comment)
-    await enforcer.add_policies(
-        [
-            (current_user.id, comment.id, "write"),
-        ]
-    )
     return CommentResponse.model_validate(comment)
 
 
@@ -109,9 +113,9 @@ async def update_comment(
         id: str,
         request: CommentRequest,
         repo: CrudRepository = Depends(get_repository),
-        current_user: User = Depends(get_current_user),
+        current_user: Principal = Depends(get_current_user),
 ):
-    if not enforcer.enforce(current_user.id, id, "write"):
+    if not await can_write(repo.db, current_user, Comment, id):
         raise HTTPException(status_code=403, detail="Permission denied")
 
     comment = Comment(
@@ -127,8 +131,8 @@ async def update_comment(
 async def delete_comment(
         id: str,
         repo: CrudRepository = Depends(get_repository),
-        current_user: User = Depends(get_current_user),
+        current_user: Principal = Depends(get_current_user),
 ):
-    if not enforcer.enforce(current_user.id, id, "write"):
+    if not await can_write(repo.db, current_user, Comment, id):
         raise HTTPException(status_code=403, detail="Permission denied")
     await repo.delete(Comment(id=id))
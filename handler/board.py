@@ -1,30 +1,38 @@
-from typing import List
+from typing import Optional
 
 from fastapi import APIRouter, Depends
 from sqlalchemy import and_
 from starlette.exceptions import HTTPException
 
-from auth import get_current_user
+from auth import Principal, get_current_user
 from model.board import Board, BoardCategory
-from model.user import RoleEnum, User
+from model.user import RoleEnum
 from schema.board import BoardRequest, BoardResponse
+from schema.page import Page
 from service.repository import CrudRepository, get_repository
 
 router = APIRouter(tags=["공지사항/게시판"])
 
 
-@router.get("/boards", response_model=List[BoardResponse])
+@router.get("/boards", response_model=Page[BoardResponse])
 async def read_boards(
     category: BoardCategory = None,
     offset: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = None,
     repo: CrudRepository = Depends(get_repository),
 ):
     clause = None
     if category:
         clause = and_(Board.category == category)
-    boards = await repo.fetch_all(Board, offset, limit, clause)
-    return [BoardResponse.model_validate(b) for b in boards]
+    boards, total, next_cursor = await repo.fetch_page(
+        Board, offset, limit, clause, cursor, projection=BoardResponse
+    )
+    return Page(
+        items=[BoardResponse.model_validate(b) for b in boards],
+        total=total,
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/board/{id}", response_model=BoardResponse)
@@ -40,7 +48,7 @@ async def read_board(
 async def create_board(
     board: BoardRequest,
     repo: CrudRepository = Depends(get_repository),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if not current_user.role != RoleEnum.ADMIN:
         raise HTTPException(status_code=403, detail="Permission denied")
@@ -59,7 +67,7 @@ async def update_board(
     id: str,
     request: BoardRequest,
     repo: CrudRepository = Depends(get_repository),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if not current_user.role != RoleEnum.ADMIN:
         raise HTTPException(status_code=403, detail="Permission denied")
@@ -73,7 +81,7 @@ async def update_board(
 async def delete_board(
     id: str,
     repo: CrudRepository = Depends(get_repository),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if not current_user.role != RoleEnum.ADMIN:
         raise HTTPException(status_code=403, detail="Permission denied")
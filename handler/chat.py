@@ -3,14 +3,14 @@ import json
 from contextlib import asynccontextmanager
 from typing import List
 
-from aioredis import Redis
 from fastapi import APIRouter, Depends
+from redis.asyncio import Redis
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.exceptions import HTTPException
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
-from auth import get_current_user
+from auth import Principal, get_current_user
 from common.redis_conf import get_redis
 from database import get_db
 from model.chat import Chat, ChatUser
@@ -82,7 +82,7 @@ async def get_history(
 async def create_chat(
     to_user_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     async with db.begin():
         chat = Chat()
@@ -106,7 +106,7 @@ async def create_chat(
 @router.get("/chat", response_model=List[ChatResponse])
 async def get_chat(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     result = await db.execute(
         select(Chat).join(Chat.users).where(User.id == current_user.id)
@@ -126,7 +126,7 @@ async def get_chat(
 async def delete_chat(
     chat_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     result = await db.execute(delete(Chat).where(Chat.id == chat_id))
     if result.rowcount == 0:
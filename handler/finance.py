@@ -2,11 +2,11 @@ from fastapi import APIRouter, Depends
 from starlette import status
 from starlette.exceptions import HTTPException
 
-from auth import get_current_user
-from database import enforcer
+from auth import Principal, get_current_user
 from model.finance import Finance
-from model.user import User
+from model.ideation import Ideation
 from schema.finance import FinanceRequest, FinanceResponse
+from service.authorization import can_write
 from service.repository import CrudRepository, get_repository
 
 router = APIRouter(tags=["금융"])
@@ -16,9 +16,9 @@ router = APIRouter(tags=["금융"])
 async def get_finance(
     ideation_id: str,
     repo: CrudRepository = Depends(get_repository),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    if not enforcer.enforce(current_user.id, ideation_id, "write"):
+    if not await can_write(repo.db, current_user, Ideation, ideation_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="permission denied",
@@ -34,9 +34,11 @@ async def get_finance(
 async def create_finance(
     request: FinanceRequest,
     repo: CrudRepository = Depends(get_repository),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    if not enforcer.enforce(current_user.id, request.ideation_id, "write"):
+    if not await can_write(
+        repo.db, current_user, Ideation, request.ideation_id
+    ):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="permission denied",
@@ -59,9 +61,11 @@ async def create_finance(
 async def update_finance(
     request: FinanceRequest,
     repo: CrudRepository = Depends(get_repository),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    if not enforcer.enforce(current_user.id, request.ideation_id, "write"):
+    if not await can_write(
+        repo.db, current_user, Ideation, request.ideation_id
+    ):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="permission denied",
@@ -78,9 +82,9 @@ async def update_finance(
 async def delete_finance(
     ideation_id: str,
     repo: CrudRepository = Depends(get_repository),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    if not enforcer.enforce(current_user.id, ideation_id, "write"):
+    if not await can_write(repo.db, current_user, Ideation, ideation_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="permission denied",
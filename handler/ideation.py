@@ -5,17 +5,20 @@ from typing import Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, Request
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from starlette import status
 
-from auth import get_current_user
-from database import enforcer, get_db
+from auth import Principal, get_current_user
+from common.db_routing import db_route
+from database import get_db
 from model.ideation import Ideation, Theme, Status
-from model.user import User
 from schema.attachment import AttachmentResponse
 from schema.ideation import IdeationRequest, IdeationResponse, ThemeResponse
 from schema.invest import InvestmentResponse
-from service.ideation import find_theme_by_id, find_ideation_by_id
+from schema.page import Page
+from service.authorization import can_write
+from service.ideation import (fetch_ideation_cards, find_theme_by_id,
+                              ideation_loader)
+from service.loading import loaded_attributes
 from service.repository import CrudRepository, get_repository
 from utils.path_util import save_image, save_file
 
@@ -30,7 +33,9 @@ async def get_themes(
     clauses = None
     if theme_id:
         clauses = and_(Theme.id == theme_id)
-    themes = await repo.fetch_all(Theme, limit=100, clauses=clauses)
+    themes = await repo.fetch_all(
+        Theme, limit=100, clauses=clauses, projection=ThemeResponse
+    )
     return [ThemeResponse.model_validate(theme) for theme in themes]
 
 
@@ -55,7 +60,7 @@ async def fetch_ideation_list_by_themes(
             Ideation.id,
             func.row_number()
             .over(
-                partition_by=Ideation.theme,
+                partition_by=Ideation.theme_id,
                 order_by=Ideation.created_at.desc(),
             )
             .label("rn"),
@@ -64,58 +69,66 @@ async def fetch_ideation_list_by_themes(
         .subquery()
     )
 
-    # 2. 메인 쿼리: 상위 N개의 id를 가진 Ideation 엔티티 및 조인된 데이터 가져오기
-    query = (
-        select(Ideation)
-        .where(
-            Ideation.id.in_(
-                select(subquery.c.id).where(
-                    subquery.c.rn <= offset + limit, subquery.c.rn > offset
-                )
+    # 2. 메인 쿼리: 상위 N개의 id를 가진 Ideation의 card 컬럼만 조회
+    cards = await fetch_ideation_cards(
+        db,
+        Ideation.id.in_(
+            select(subquery.c.id).where(
+                subquery.c.rn <= offset + limit, subquery.c.rn > offset
             )
-        )
-        .options(
-            selectinload(Ideation.user),
-            selectinload(Ideation.investments),
-        )
+        ),
     )
 
-    result = await db.execute(query)
-    ideations = result.unique().scalars().all()
-
     # 결과를 각 테마별로 그룹화
     theme_ideations = defaultdict(list)
-    for ideation in ideations:
-        theme = ThemeResponse.model_validate(ideation.theme)
-        investments = [
-            InvestmentResponse.model_validate(i) for i in ideation.investments
-        ]
-
-        ideation_props = ideation.__dict__
-        ideation_props["theme"] = theme
-        ideation_props["investments"] = investments
-        res = IdeationResponse.model_validate(ideation_props)
-        theme_ideations[ideation.theme.name].append(res)
+    for card in cards:
+        theme_ideations[card["theme"]["name"]].append(card)
 
     return theme_ideations
 
 
-@router.get("/ideation/user", response_model=List[IdeationResponse])
+def _to_card_response(ideation: Ideation) -> IdeationResponse:
+    # card 프로필에서 로딩하지 않은 관계(첨부파일, 댓글)는 None으로 응답
+    ideation_props = loaded_attributes(ideation)
+    ideation_props["theme"] = ThemeResponse.model_validate(ideation.theme)
+    ideation_props["investments"] = [
+        InvestmentResponse.model_validate(i) for i in ideation.investments
+    ]
+    ideation_props["images"] = [
+        AttachmentResponse.model_validate(i) for i in ideation.images
+    ]
+    return IdeationResponse.model_validate(ideation_props)
+
+
+@router.get("/ideation/user", response_model=Page[IdeationResponse])
+@db_route("primary")  # 내 아이디어 목록은 항상 최신 데이터로
 async def get_ideation_by_user(
         offset: int = 0,
         limit: int = 10,
-        current_user: User = Depends(get_current_user),
+        cursor: Optional[str] = None,
+        current_user: Principal = Depends(get_current_user),
         repo: CrudRepository = Depends(get_repository),
 ):
     clauses = and_(Ideation.user_id == current_user.id)
-    ideations = await repo.fetch_all(Ideation, offset=offset, limit=limit, clauses=clauses)
-    return [IdeationResponse.model_validate(ideation) for ideation in ideations]
+    ideations, total, next_cursor = await repo.fetch_page(
+        Ideation,
+        offset=offset,
+        limit=limit,
+        clauses=clauses,
+        cursor=cursor,
+        profile="card",
+    )
+    return Page(
+        items=[_to_card_response(ideation) for ideation in ideations],
+        total=total,
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/ideation/{ideation_id}", response_model=IdeationResponse)
 async def get_ideation(
-        current_user: User = Depends(get_current_user),
-        ideation: Ideation = Depends(find_ideation_by_id),
+        current_user: Principal = Depends(get_current_user),
+        ideation: Ideation = Depends(ideation_loader("detail")),
 ):
     if current_user.id != ideation.user_id:
         ideation.view_count += 1
@@ -136,7 +149,7 @@ async def create_ideation(
 
         repo: CrudRepository = Depends(get_repository),
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_user),
+        current_user: Principal = Depends(get_current_user),
 ):
     ideation = Ideation(
         title=title,
@@ -149,8 +162,8 @@ async def create_ideation(
     ideation.theme = await find_theme_by_id(theme_id, db)
     ideation.images = [] if not images else [await save_image(image, ideation.id, request) for image in images]
     ideation.attachments = [] if not files else [await save_file(f, ideation.id) for f in files]
+    # 작성자 권한은 ideation.user_id로 판단하므로 casbin 정책을 추가하지 않음
     ideation = await repo.create(ideation)
-    await enforcer.add_policies([(current_user.id, ideation.id, "write")])
 
     response = IdeationResponse.model_validate(ideation)
     response.images = [AttachmentResponse.model_validate(i) for i in ideation.images]
@@ -162,11 +175,12 @@ async def create_ideation(
 async def update_ideation(
         ideation_id: str,
         request: IdeationRequest = Depends(),
-        ideation: Ideation = Depends(find_ideation_by_id),
+        ideation: Ideation = Depends(ideation_loader("detail")),
         theme: Theme = Depends(find_theme_by_id),
-        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(get_current_user),
 ):
-    if not enforcer.enforce(current_user.id, ideation_id, "write"):
+    if not await can_write(db, current_user, Ideation, ideation_id, ideation):
         raise HTTPException(status_code=403, detail="Permission denied")
 
     ideation.theme = theme
@@ -180,11 +194,11 @@ async def update_ideation(
     "/ideations/{ideation_id}", status_code=status.HTTP_204_NO_CONTENT
 )
 async def delete_ideation(
-        ideation: Ideation = Depends(find_ideation_by_id),
+        ideation: Ideation = Depends(ideation_loader("owner")),
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_user),
+        current_user: Principal = Depends(get_current_user),
 ):
-    if not enforcer.enforce(current_user.id, ideation.id, "write"):
+    if not await can_write(db, current_user, Ideation, ideation.id, ideation):
         raise HTTPException(status_code=403, detail="Permission denied")
     await db.delete(ideation)
 
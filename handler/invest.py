@@ -1,15 +1,15 @@
-from typing import List
+from typing import Optional
 
 from fastapi import APIRouter, Depends
 from starlette import status
 from starlette.exceptions import HTTPException
 
-from auth import get_current_user
-from database import enforcer
+from auth import Principal, get_current_user
+from database import policy_index, run_after_commit
 from model.invest import Investment, Investor
-from model.user import User
 from schema.invest import (InvestmentRequest, InvestmentResponse,
                            InvestorRequest, InvestorResponse)
+from schema.page import Page
 from service.repository import CrudRepository, get_repository
 
 router = APIRouter(tags=["투자"])
@@ -19,19 +19,21 @@ router = APIRouter(tags=["투자"])
 async def create_investment(
     request: InvestmentRequest,
     repo: CrudRepository = Depends(get_repository),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     # FIXME investor를 group으로 바꾸던가 해야함
     # if not current_user.group_id == request.investor_id:
     #     raise HTTPException(status_code=403, detail="Permission denied")
     investment = Investment(**request.dict())
+    # 작성자 권한은 created_by로 판단하고, casbin에는 group 권한만 추가
+    investment.created_by = current_user.id
     investment = await repo.create(investment)
-    await enforcer.add_policies(
-        [
-            (current_user.id, investment.id, "write"),
-            (current_user.group_id, investment.id, "write"),
-        ]
-    )
+    if current_user.group_id:
+        await run_after_commit(
+            repo.db,
+            policy_index.add_policies,
+            [(current_user.group_id, investment.id, "write")],
+        )
     return InvestmentResponse.model_validate(investment)
 
 
@@ -40,9 +42,9 @@ async def update_investment(
     investment_id: str,
     request: InvestmentRequest,
     repo: CrudRepository = Depends(get_repository),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    # if not enforcer.enforce(current_user.id, investment_id, "write"):
+    # if not await can_write(repo.db, current_user, Investment, investment_id):
     #     raise HTTPException(status_code=403, detail="Permission denied")
     investment = Investment(id=investment_id, **request.dict())
     investment = await repo.update(investment)
@@ -55,21 +57,28 @@ async def update_investment(
 async def delete_investment(
     investment_id: str,
     repo: CrudRepository = Depends(get_repository),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    # if not enforcer.enforce(current_user.id, investment_id, "write"):
+    # if not await can_write(repo.db, current_user, Investment, investment_id):
     #     raise HTTPException(status_code=403, detail="Permission denied")
     await repo.delete(Investment(id=investment_id))
 
 
-@router.get("/investors", response_model=List[InvestorResponse])
+@router.get("/investors", response_model=Page[InvestorResponse])
 async def get_investors(
     offset: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = None,
     repo: CrudRepository = Depends(get_repository),
 ):
-    investors = await repo.fetch_all(Investor, offset, limit)
-    return [InvestorResponse.model_validate(i) for i in investors]
+    investors, total, next_cursor = await repo.fetch_page(
+        Investor, offset, limit, cursor=cursor, projection=InvestorResponse
+    )
+    return Page(
+        items=[InvestorResponse.model_validate(i) for i in investors],
+        total=total,
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/investor/{investor_id}", response_model=InvestorResponse)
@@ -85,15 +94,11 @@ async def get_investor(
 async def create_investor(
     request: InvestorRequest,
     repo: CrudRepository = Depends(get_repository),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     investor = Investor(**request.dict())
+    # group 사용자 권한은 user.group_id == investor.id로 판단
     investor = await repo.create(investor)
-    await enforcer.add_policies(
-        [
-            (investor.id, investor.id, "write"),  # group 사용자 권한
-        ]
-    )
     return InvestorResponse.model_validate(investor)
 
 
@@ -102,12 +107,12 @@ async def update_investor(
     investor_id: str,
     request: InvestorRequest,
     repo: CrudRepository = Depends(get_repository),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    # if not enforcer.enforce(current_user.group_id, investor_id, "write"):
+    # if not await can_write(repo.db, current_user, Investor, investor_id):
     #     raise HTTPException(status_code=403, detail="Permission denied")
 
-    investor = Investor(id=investor_id, **request.dict())
+    investor = Investor(id=investor_id, **request.dict(exclude={"id"}))
     investor = await repo.update(investor)
     return InvestorResponse.model_validate(investor)
 
@@ -118,8 +123,8 @@ async def update_investor(
 async def delete_investor(
     investor_id: str,
     repo: CrudRepository = Depends(get_repository),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    # if not enforcer.enforce(current_user.group_id, investor_id, "write"):
+    # if not await can_write(repo.db, current_user, Investor, investor_id):
     #     raise HTTPException(status_code=403, detail="Permission denied")
     await repo.delete(Investor(id=investor_id))
@@ -7,8 +7,8 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
-from auth import (ACCESS_TOKEN_EXPIRE_MINUTES, authenticate_user,
-                  create_access_token)
+from auth import (ACCESS_TOKEN_EXPIRE_MINUTES, Principal, authenticate_user,
+                  create_access_token, get_current_user, revoke_token)
 from database import get_db
 from model.user import User
 from schema.token import Token, UserToken
@@ -36,12 +36,13 @@ async def login(
     return _create_token(user)
 
 
-@router.post("/logout")
-async def logout():
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="Not implemented",
-    )
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    # 요청에 사용한 access token을 폐기
+    await revoke_token(db, current_user)
 
 
 @router.post("/forgot-password")
@@ -69,7 +70,7 @@ async def create_user(
         name=request.name,
         email=request.email,
     )
-    db_user.password = request.password
+    await db_user.set_password(request.password)
     db.add(db_user)
     try:
         await db.refresh(db_user)
@@ -1,13 +1,16 @@
 import os.path
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.inmemory import InMemoryBackend
 from starlette.middleware.cors import CORSMiddleware
 from starlette.staticfiles import StaticFiles
 
+from auth import Principal, get_current_user
 from common.config import ASSETS_DIR
+from common.pool import pool_status, warm_up
+from common.query_stats import query_stats_middleware
 from handler.attachment import router as attachment_router
 from handler.board import router as board_router
 from handler.chat import router as chat_router
@@ -16,20 +19,43 @@ from handler.ideation import router as ideation_router
 from handler.invest import router as invest_router
 from handler.user import router as user_router
 from mock import create_mock
+from model.user import RoleEnum
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("App is starting up...")
-    from database import init_db
+    from auth import load_revoked_tokens, token_denylist
+    from database import (engines, init_db, policy_index, policy_watcher,
+                          policy_writer, token_watcher)
     FastAPICache.init(InMemoryBackend())
+    if policy_watcher is not None:
+        # 정책을 읽기 전에 구독해야 그 사이의 변경이 빠지지 않음
+        await policy_watcher.start(policy_index.apply)
+    if token_watcher is not None:
+        await token_watcher.start(token_denylist.apply)
     if os.path.exists("test.db"):
         await init_db()
     else:
         await init_db()
         await create_mock()
+    await load_revoked_tokens()
+    for engine in engines.values():
+        await warm_up(engine)
+    if policy_writer is not None:
+        policy_writer.start()
     yield
     print("App is shutting down...")
+    if policy_writer is not None:
+        # 아직 저장하지 않은 정책을 모두 저장
+        await policy_writer.stop()
+    if policy_watcher is not None:
+        await policy_watcher.stop()
+    if token_watcher is not None:
+        await token_watcher.stop()
+    from database import slow_query_logs
+    for slow_query_log in slow_query_logs:
+        await slow_query_log.drain()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -44,6 +70,8 @@ app.include_router(finance_router)
 
 app.mount("/assets", StaticFiles(directory=ASSETS_DIR), name="assets")
 
+app.middleware("http")(query_stats_middleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -52,8 +80,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # 모든 HTTP 메서드 허용
     allow_headers=["*"],  # 모든 HTTP 헤더 허용
+    expose_headers=["Server-Timing"],
 )
 
+
+@app.get("/health/db")
+async def get_db_health(current_user: Principal = Depends(get_current_user)):
+    """
+    engine별 pool 상태 (checkout 중인 connection 수, overflow, checkout 대기 시간)
+    내부 정보이므로 관리자만 조회할 수 있습니다.
+    """
+    if current_user.role != RoleEnum.ADMIN.value:
+        raise HTTPException(status_code=403, detail="Permission denied")
+    from database import engines
+
+    return {name: pool_status(engine) for name, engine in engines.items()}
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -1,37 +1,40 @@
 import random
 from datetime import datetime, timedelta
 
-from database import AsyncSessionLocal, enforcer
+from database import AsyncSessionLocal, policy_index
 from model.attachment import Attachment, Comment, Image
 from model.board import Board, BoardCategory
 from model.finance import Finance
 from model.ideation import Ideation, Status, Theme
 from model.invest import Investment, Investor
 from model.user import Group, RoleEnum, User
+from service.repository import CrudRepository
 
 
 async def create_mock():
     async with AsyncSessionLocal() as session:
-        async with session.begin():
-            try:
-                mock_data = get_mock_themes()
-                mock_data += get_mock_investors()
-                mock_data += get_mock_users()
-                mock_data += get_mock_image()
-                mock_data += get_mock_ideation()
-                mock_data += get_mock_attachment()
-                mock_data += get_mock_comment()
-                mock_data += get_mock_board()
-                mock_data += get_mock_finance()
-                session.add_all(mock_data)
-                await session.commit()
+        try:
+            ideations = get_mock_ideation()
+            mock_data = get_mock_themes()
+            mock_data += get_mock_investors()
+            mock_data += get_mock_users()
+            mock_data += get_mock_image()
+            mock_data += ideations
+            # bulk insert는 관계를 저장하지 않으므로 투자 내역을 따로 추가
+            mock_data += [i for ideation in ideations for i in ideation.investments]
+            mock_data += get_mock_attachment()
+            mock_data += get_mock_comment()
+            mock_data += get_mock_board()
+            mock_data += get_mock_finance()
+            await CrudRepository(session).create_many(mock_data)
+            await session.commit()
 
-                polices = [("user_1", f"ideation_{i}", "write") for i in range(1, 8)]
-                polices += [("user_1", f"attachment_{i}", "write") for i in range(1, 3)]
-                await enforcer.add_policies(polices)
-            except Exception as e:
-                await session.rollback()
-                raise e
+            # ideation 작성자 권한은 user_id로 판단하므로 첨부파일 권한만 추가
+            polices = [("user_1", f"attachment_{i}", "write") for i in range(1, 3)]
+            await policy_index.add_policies(polices)
+        except Exception as e:
+            await session.rollback()
+            raise e
 
 
 def get_mock_themes():
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from database import Base
@@ -6,6 +6,7 @@ from database import Base
 
 class Attachment(Base):
     __tablename__ = "attachments"
+    __table_args__ = (Index("ix_attachments_related_id", "related_id"),)
 
     file_name = Column(String, nullable=False)  # 파일 이름
     file_path = Column(String, nullable=False)  # 파일 경로 (s3 저장 경로)
@@ -14,6 +15,7 @@ class Attachment(Base):
 
 class Image(Base):
     __tablename__ = "images"
+    __table_args__ = (Index("ix_images_related_id", "related_id"),)
 
     file_name = Column(String, nullable=False)  # 파일 이름
     file_path = Column(String, nullable=False)  # 파일 경로 (s3 저장 경로)
@@ -22,6 +24,15 @@ class Image(Base):
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # /comment/{id}: 대상별 최신순 페이지
+        Index(
+            "ix_comments_related_id_created_at_id",
+            "related_id",
+            "created_at",
+            "id",
+        ),
+    )
 
     related_id = Column(String, nullable=False)  # 연결된 id
     content = Column(String, nullable=False)  # 내용
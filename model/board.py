@@ -1,6 +1,6 @@
 import enum
 
-from sqlalchemy import Column, Enum, String
+from sqlalchemy import Column, Enum, Index, String
 
 from database import Base
 
@@ -15,6 +15,13 @@ class BoardCategory(enum.Enum):
 # 공지사항
 class Board(Base):
     __tablename__ = "boards"
+    __table_args__ = (
+        # /boards?category= 최신순 페이지
+        Index(
+            "ix_boards_category_created_at_id", "category", "created_at", "id"
+        ),
+        Index("ix_boards_created_at_id", "created_at", "id"),
+    )
 
     category = Column(Enum(BoardCategory), nullable=False)  # Enum 타입 사용
     title = Column(String, nullable=False)  # 제목
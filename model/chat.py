@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, String
 from sqlalchemy.orm import backref, relationship
 
 from database import Base
@@ -6,6 +6,10 @@ from database import Base
 
 class ChatUser(Base):
     __tablename__ = "chat_user"
+    __table_args__ = (
+        Index("ix_chat_user_chat_id_user_id", "chat_id", "user_id"),
+        Index("ix_chat_user_user_id_chat_id", "user_id", "chat_id"),
+    )
 
     chat_id = Column(String)
     user_id = Column(String)
@@ -1,10 +1,11 @@
-from sqlalchemy import JSON, Column, Float, String
+from sqlalchemy import JSON, Column, Float, Index, String
 
 from database import Base
 
 
 class Finance(Base):
     __tablename__ = "finances"
+    __table_args__ = (Index("ix_finances_ideation_id", "ideation_id"),)
 
     ideation_id = Column(String, nullable=False)  # 아이디어 ID
 
@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Enum, Integer, String, Float
+from sqlalchemy import Column, DateTime, Enum, Float, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from database import Base
@@ -16,6 +16,9 @@ class Status(enum.Enum):
 # 아이디어 테마
 class Theme(Base):
     __tablename__ = "themes"
+    __table_args__ = (
+        Index("ix_themes_created_at_id", "created_at", "id"),  # /themes
+    )
 
     name = Column(String)
     description = Column(String)
@@ -26,6 +29,17 @@ class Theme(Base):
 # 아이디어
 class Ideation(Base):
     __tablename__ = "ideations"
+    __table_args__ = (
+        # /ideation/themes: 테마별 최신순 row_number
+        Index("ix_ideations_theme_id_created_at", "theme_id", "created_at"),
+        # /ideation/user: 대표자별 최신순 페이지
+        Index(
+            "ix_ideations_user_id_created_at_id",
+            "user_id",
+            "created_at",
+            "id",
+        ),
+    )
 
     title = Column(String)  # 제목
     content = Column(String)  # 아이디어 설명
@@ -60,7 +74,7 @@ class Ideation(Base):
         "Investment",
         primaryjoin="Ideation.id == foreign(Investment.ideation_id)",
         back_populates="ideation",
-        lazy="joined",
+        lazy="selectin",
         cascade="all, delete-orphan",
     )
 
@@ -68,7 +82,7 @@ class Ideation(Base):
         "Image",
         primaryjoin="Ideation.id == foreign(Image.related_id)",
         backref="ideation_images",
-        lazy="joined",
+        lazy="selectin",
         cascade="all, delete-orphan",
     )
 
@@ -76,7 +90,7 @@ class Ideation(Base):
         "Attachment",
         primaryjoin="Ideation.id == foreign(Attachment.related_id)",
         backref="ideation_attachments",
-        lazy="joined",
+        lazy="selectin",
         cascade="all, delete-orphan",
     )
 
@@ -84,6 +98,6 @@ class Ideation(Base):
         "Comment",
         primaryjoin="Ideation.id == foreign(Comment.related_id)",
         backref="ideation_comments",
-        lazy="joined",
+        lazy="selectin",
         cascade="all, delete-orphan",
     )
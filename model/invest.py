@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String
+from sqlalchemy import Boolean, Column, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from database import Base
@@ -7,6 +7,9 @@ from database import Base
 # 투자회사
 class Investor(Base):
     __tablename__ = "investors"
+    __table_args__ = (
+        Index("ix_investors_created_at_id", "created_at", "id"),  # /investors
+    )
 
     name = Column(String)  # 회사명
     description = Column(String)  # 설명
@@ -17,6 +20,10 @@ class Investor(Base):
 
 class Investment(Base):
     __tablename__ = "investments"
+    __table_args__ = (
+        Index("ix_investments_ideation_id", "ideation_id"),
+        Index("ix_investments_investor_id", "investor_id"),
+    )
 
     ideation_id = Column(String)  # 연결된 id
     ideation = relationship(
@@ -1,10 +1,11 @@
 import enum
 
-from sqlalchemy import JSON, Column, Enum, String
+from sqlalchemy import JSON, Column, Enum, Integer, String
 from sqlalchemy.orm import relationship
 
 from database import Base
-from utils.auth import get_password_hash, verify_password
+from utils.auth import (get_password_hash, hash_password, verify_and_update,
+                        verify_password)
 
 
 class RoleEnum(enum.Enum):
@@ -25,7 +26,7 @@ class User(Base):
     role = Column(Enum(RoleEnum), default=RoleEnum.USER)
     expertises = Column(JSON, nullable=True)
 
-    group_id = Column(String, nullable=True)
+    group_id = Column(String, nullable=True, index=True)
 
     @property
     def password(self):
@@ -38,6 +39,33 @@ class User(Base):
     def verify_password(self, plain_password: str) -> bool:
         return verify_password(plain_password, self._password)
 
+    async def set_password(self, plain_password: str):
+        # 요청 처리 중에는 event loop를 막지 않도록 이 메서드를 사용
+        self._password = await hash_password(plain_password)
+
+    async def check_password(self, plain_password: str) -> bool:
+        """
+        thread pool에서 비밀번호를 확인합니다.
+        hash가 deprecated(rounds 변경 등)이면 새 hash로 교체합니다. (commit은 호출한 쪽)
+        """
+        verified, new_hash = await verify_and_update(
+            plain_password, self._password
+        )
+        if verified and new_hash:
+            self._password = new_hash
+        return verified
+
+
+class RevokedToken(Base):
+    """
+    로그아웃한 access token (id = jti)
+    expires_at이 지난 token은 서명 검증에서 거부되므로 보관할 필요가 없습니다.
+    """
+
+    __tablename__ = "revoked_tokens"
+
+    expires_at = Column(Integer, nullable=False, index=True)  # JWT exp (초)
+
 
 class Group(Base):
     __tablename__ = "groups"
@@ -0,0 +1,11 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    total: Optional[int] = None  # offset이 범위를 넘은 경우 None
+    next_cursor: Optional[str] = None  # 마지막 페이지이면 None
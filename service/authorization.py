@@ -0,0 +1,144 @@
+import asyncio
+from dataclasses import replace
+
+from sqlalchemy import bindparam, event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from auth import Principal
+from common.role_links import MISSING
+from database import policy_index
+from model.attachment import Comment
+from model.ideation import Ideation
+from model.invest import Investment, Investor
+from model.user import User
+from service.statements import cached_statement
+
+# entity class -> (소유자 컬럼, 비교할 User 속성)
+# 생성자가 소유하는 row는 casbin 정책 대신 이 컬럼으로 권한을 판단합니다.
+OWNER_COLUMNS = {
+    Ideation: ("user_id", "id"),
+    Comment: ("user_id", "id"),
+    Investment: ("created_by", "id"),
+    # investor는 같은 group(= investor id)의 사용자가 소유
+    Investor: ("id", "group_id"),
+}
+
+
+def owner_subject(user: Principal, entity_class):
+    _, attribute = OWNER_COLUMNS[entity_class]
+    return getattr(user, attribute)
+
+
+def is_owner(user: Principal, entity) -> bool:
+    column, _ = OWNER_COLUMNS[type(entity)]
+    subject = owner_subject(user, type(entity))
+    return subject is not None and getattr(entity, column) == subject
+
+
+def owned_by(entity_class):
+    """
+    SELECT 1 WHERE id = :id AND owner = :owner LIMIT 1
+    """
+    column, _ = OWNER_COLUMNS[entity_class]
+
+    def build():
+        return (
+            select(1)
+            .where(
+                entity_class.id == bindparam("id"),
+                getattr(entity_class, column) == bindparam("owner"),
+            )
+            .limit(1)
+        )
+
+    return cached_statement(("owned_by", entity_class), build)
+
+
+def user_group_statement():
+    """
+    SELECT users.group_id WHERE users.id = :id
+    """
+    return cached_statement(
+        "user_group",
+        lambda: select(User.group_id).where(User.id == bindparam("id")),
+    )
+
+
+async def current_group(db: AsyncSession, user_id: str):
+    """
+    사용자의 현재 group (User.group_id, 캐시)
+    token의 group_id는 발급 이후 group이 바뀌었을 수 있으므로 사용하지 않습니다.
+    """
+    group_id = policy_index.group(user_id)
+    if group_id is MISSING:
+        version = policy_index.group_version
+        result = await db.execute(user_group_statement(), {"id": user_id})
+        group_id = result.scalar()
+        policy_index.set_group(user_id, group_id, version)
+    return group_id
+
+
+# 진행 중인 group 변경 전파 (task가 GC되지 않도록 참조 유지)
+_publish_tasks = set()
+
+
+@event.listens_for(User.group_id, "set")
+def group_id_changed(target, value, oldvalue, initiator):
+    # commit 시(after_commit) group 캐시를 지우고 다른 worker에 전파
+    session = object_session(target)
+    if session is None or target.id is None or value == oldvalue:
+        return
+    session.info.setdefault("group_changed", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def group_changes_committed(session):
+    # get_db가 아닌 session(스크립트, 시작 코드 등)의 commit도 포함
+    subs = session.info.pop("group_changed", None)
+    if not subs:
+        return
+    policy_index.forget_groups(subs)
+    if policy_index.watcher is None:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # event loop 밖(sync session)에서는 다른 worker에 전파하지 않음
+        return
+    task = loop.create_task(policy_index.publish_groups(list(subs)))
+    _publish_tasks.add(task)
+    task.add_done_callback(_publish_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def group_changes_rolled_back(session):
+    session.info.pop("group_changed", None)
+
+
+async def can_write(
+    db: AsyncSession,
+    user: Principal,
+    entity_class,
+    entity_id: str,
+    entity=None,
+) -> bool:
+    """
+    user가 entity를 수정할 수 있는지 확인합니다.
+    1. casbin에 명시적으로 부여된 권한 (user 또는 속한 group, 관리자)
+    2. row의 소유자 컬럼 (이미 로딩한 entity가 있으면 쿼리하지 않음)
+    """
+    group_id = await current_group(db, user.id)
+    if group_id != user.group_id:
+        user = replace(user, group_id=group_id)
+    if await policy_index.authorize(user.id, entity_id, "write", group_id):
+        return True
+    if entity is not None:
+        return is_owner(user, entity)
+    subject = owner_subject(user, entity_class)
+    if subject is None:
+        return False
+    result = await db.execute(
+        owned_by(entity_class), {"id": entity_id, "owner": subject}
+    )
+    return result.scalar() is not None
@@ -1,12 +1,20 @@
+from collections import defaultdict
+
 from fastapi import Depends
-from sqlalchemy import update, select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 from starlette import status
 from starlette.exceptions import HTTPException
 
 from database import AsyncSessionLocal, get_db
+from model.attachment import Image
 from model.ideation import Ideation, Theme
+from model.invest import Investment, Investor
+from schema.attachment import AttachmentResponse
+from schema.ideation import IdeationResponse, ThemeResponse
+from schema.invest import InvestmentResponse, InvestorResponse
+from service.loading import loading_options, projected_columns, row_to_dict
+from service.statements import select_by
 
 
 async def increment_view_count(ideation_id: str, user_id: str):
@@ -32,16 +40,15 @@ async def increment_view_count(ideation_id: str, user_id: str):
 async def find_ideation_by_id(
         ideation_id: str,
         db: AsyncSession = Depends(get_db),
+        profile: str = "detail",
 ) -> Ideation:
+    """
+    profile(card, detail, owner)에 맞는 관계만 로딩하여 아이디어를 조회합니다.
+    """
+    # 관계 로딩 쿼리가 호출 시간을 차지하므로 statement 캐시를 쓰지 않음
     query = (
         select(Ideation)
-        .options(
-            joinedload(Ideation.theme),  # Theme 테이블 조인
-            joinedload(Ideation.user),  # User 테이블 조인
-            joinedload(Ideation.investments),  # Investment 테이블 조인
-            joinedload(Ideation.attachments),  # Attachment 테이블 조인
-            joinedload(Ideation.comments),  # Comment 테이블 조인
-        )
+        .options(*loading_options(Ideation, profile))
         .where(Ideation.id == ideation_id)
     )
     result = await db.execute(query)
@@ -54,13 +61,28 @@ async def find_ideation_by_id(
     return ideation
 
 
+def ideation_loader(profile: str):
+    """
+    주어진 로딩 프로필로 아이디어를 조회하는 dependency를 반환합니다.
+    """
+
+    async def dependency(
+            ideation_id: str,
+            db: AsyncSession = Depends(get_db),
+    ) -> Ideation:
+        return await find_ideation_by_id(ideation_id, db, profile)
+
+    return dependency
+
+
 async def find_theme_by_id(
         theme_id: str,
         db: AsyncSession = Depends(get_db),
 ):
     # theme_id = request.theme_id
-    query = select(Theme).where(Theme.id == theme_id)
-    result = await db.execute(query)
+    result = await db.execute(
+        select_by(Theme, Theme.id), {"value": theme_id}
+    )
     theme = result.unique().scalar_one_or_none()
     if not theme:
         raise HTTPException(
@@ -68,3 +90,58 @@ async def find_theme_by_id(
             detail=f"Theme({theme_id}) not found",
         )
     return theme
+
+
+async def fetch_ideation_cards(db: AsyncSession, clauses):
+    """
+    card 응답(IdeationResponse)에 필요한 컬럼만 조회하여 dict 목록으로 반환합니다.
+    ORM entity를 만들지 않으므로 identity map, 관계 로딩 비용이 없습니다.
+    - ideation + theme: join 1회
+    - investments(+ investor), images: ideation id 목록으로 각 1회
+    """
+    ideation_columns = projected_columns(Ideation, IdeationResponse)
+    theme_columns = projected_columns(Theme, ThemeResponse, prefix="theme_")
+    rows = await db.execute(
+        select(*ideation_columns, *theme_columns)
+        .join(Theme, Theme.id == Ideation.theme_id)
+        .where(clauses)
+        .order_by(Ideation.created_at.desc(), Ideation.id.desc())
+    )
+    cards = {}
+    for row in rows:
+        card = row_to_dict(row, ideation_columns)
+        card["theme"] = row_to_dict(row, theme_columns, "theme_")
+        cards[card["id"]] = card
+    if not cards:
+        return []
+
+    investment_columns = projected_columns(Investment, InvestmentResponse)
+    investor_columns = projected_columns(
+        Investor, InvestorResponse, prefix="investor_"
+    )
+    investments = defaultdict(list)
+    rows = await db.execute(
+        select(*investment_columns, *investor_columns)
+        .join(Investor, Investor.id == Investment.investor_id)
+        .where(Investment.ideation_id.in_(cards))
+    )
+    for row in rows:
+        investment = row_to_dict(row, investment_columns)
+        investment["investor"] = row_to_dict(
+            row, investor_columns, "investor_"
+        )
+        investments[investment["ideation_id"]].append(investment)
+
+    image_columns = projected_columns(Image, AttachmentResponse)
+    images = defaultdict(list)
+    rows = await db.execute(
+        select(*image_columns).where(Image.related_id.in_(cards))
+    )
+    for row in rows:
+        image = row_to_dict(row, image_columns)
+        images[image["related_id"]].append(image)
+
+    for ideation_id, card in cards.items():
+        card["investments"] = investments[ideation_id]
+        card["images"] = images[ideation_id]
+    return list(cards.values())
@@ -0,0 +1,105 @@
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+
+from model.attachment import Comment
+from model.ideation import Ideation
+from model.invest import Investment
+
+
+# Investment.ideation은 이미 로딩된 부모이므로 다시 조인하지 않음
+_investments = selectinload(Ideation.investments).options(
+    raiseload(Investment.ideation),
+    joinedload(Investment.investor),
+)
+
+
+# 엔드포인트별 관계 로딩 전략
+# - card: 목록 카드 (테마, 대표자, 투자현황, 이미지)
+# - detail: 상세 조회 (모든 관계)
+# - owner: 수정/삭제 (cascade 대상 컬렉션만, 하위 관계는 로딩하지 않음)
+LOADING_PROFILES = {
+    Ideation: {
+        "card": [
+            joinedload(Ideation.theme),
+            joinedload(Ideation.user),
+            _investments,
+            selectinload(Ideation.images),
+            raiseload(Ideation.attachments),
+            raiseload(Ideation.comments),
+        ],
+        "detail": [
+            joinedload(Ideation.theme),
+            joinedload(Ideation.user),
+            _investments,
+            selectinload(Ideation.images),
+            selectinload(Ideation.attachments),
+            selectinload(Ideation.comments).joinedload(Comment.user),
+        ],
+        "owner": [
+            raiseload(Ideation.theme),
+            raiseload(Ideation.user),
+            selectinload(Ideation.investments).raiseload("*"),
+            selectinload(Ideation.images),
+            selectinload(Ideation.attachments),
+            selectinload(Ideation.comments).raiseload("*"),
+        ],
+    },
+}
+
+
+def loading_options(entity_class, profile=None):
+    """
+    entity_class에 정의된 로딩 프로필의 loader option 목록을 반환합니다.
+    profile이 None이면 mapper 기본값을 그대로 사용합니다.
+    """
+    if profile is None:
+        return []
+    profiles = LOADING_PROFILES.get(entity_class, {})
+    if profile not in profiles:
+        raise ValueError(
+            f"Loading profile '{profile}' not found in {entity_class.__name__}"
+        )
+    return profiles[profile]
+
+
+def loaded_attributes(entity):
+    """
+    로딩된 속성만 dict로 반환합니다.
+    raiseload 된 관계는 포함되지 않으므로 응답에서 None으로 처리됩니다.
+    """
+    return {
+        key: value
+        for key, value in entity.__dict__.items()
+        if key != "_sa_instance_state"
+    }
+
+
+def projected_columns(entity_class, response_model, extra=(), prefix=""):
+    """
+    response_model이 선언한 필드 중 entity_class의 컬럼만 반환합니다.
+    (관계 필드는 제외, extra는 정렬/cursor에 필요한 컬럼)
+    prefix가 있으면 join한 다른 entity와 이름이 겹치지 않도록 label을 붙입니다.
+    """
+    column_attrs = inspect(entity_class).column_attrs
+    names = [
+        name for name in response_model.model_fields if name in column_attrs
+    ]
+    names += [
+        name for name in extra if name in column_attrs and name not in names
+    ]
+    columns = [getattr(entity_class, name) for name in names]
+    if prefix:
+        columns = [
+            column.label(prefix + name) for column, name in zip(columns, names)
+        ]
+    return columns
+
+
+def row_to_dict(row, columns, prefix=""):
+    """
+    projected_columns로 조회한 Row에서 columns 값만 prefix를 떼고 dict로 반환합니다.
+    """
+    mapping = row._mapping
+    return {
+        column.key[len(prefix) :]: mapping[column.key] for column in columns
+    }
@@ -1,10 +1,123 @@
+import base64
+import json
+import os
+import time
+from datetime import datetime
+
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import (bindparam, delete, func, insert, inspect, select,
+                        tuple_, update)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from starlette import status
 from starlette.exceptions import HTTPException
 
-from database import get_db
+from database import generate_id, get_db
+from service.loading import loading_options, projected_columns
+from service.statements import cached_statement, exists_by, select_by
+
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", 1000))
+# 조건 없는 목록의 전체 개수 캐시 시간 (초)
+COUNT_CACHE_SECONDS = float(os.getenv("COUNT_CACHE_SECONDS", 60))
+
+_table_counts = {}  # entity_class -> (만료 시각, count)
+
+# INSERT ... ON CONFLICT DO UPDATE를 지원하는 dialect
+UPSERT_INSERT = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+# upsert 시 기존 row에서 유지하는 컬럼
+UPSERT_KEEP_COLUMNS = {"id", "created_at", "created_by"}
+
+
+def encode_cursor(entity, total=None) -> str:
+    """
+    마지막 row의 (created_at, id)를 불투명한 cursor 문자열로 변환합니다.
+    첫 페이지에서 구한 total을 함께 담아 다음 페이지에서 다시 세지 않습니다.
+    """
+    payload = [entity.created_at.isoformat(), entity.id]
+    if total is not None:
+        payload.append(total)
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def _cursor_values(cursor: str):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(values[0]), values[1], values[2:]
+    except (ValueError, TypeError, IndexError, KeyError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"invalid cursor: {cursor}",
+        )
+
+
+def decode_cursor(cursor: str):
+    created_at, entity_id, _ = _cursor_values(cursor)
+    return created_at, entity_id
+
+
+def cursor_total(cursor: str):
+    _, _, rest = _cursor_values(cursor)
+    return rest[0] if rest else None
+
+
+def get_field(entity_class, field_name):
+    field = getattr(entity_class, field_name, None)
+    if not field:
+        raise ModuleNotFoundError(
+            f"Field '{field_name}' not found in {entity_class.__name__}"
+        )
+    return field
+
+
+def returning_options(entity_class):
+    """
+    RETURNING 으로 받은 entity에는 joined 관계가 채워지지 않으므로
+    mapper에서 eager로 선언된 관계를 selectinload로 대신 로딩합니다.
+    (하위 관계는 응답에 필요하지 않으므로 로딩하지 않음)
+    """
+    return [
+        selectinload(relationship).raiseload("*")
+        for relationship in inspect(entity_class).relationships
+        if relationship.lazy in ("joined", "selectin", "subquery")
+    ]
+
+
+def to_row(entity) -> dict:
+    """
+    entity에 설정된 컬럼 값을 bulk insert용 dict로 변환합니다.
+    id가 없으면 before_insert와 같은 규칙으로 생성합니다.
+    """
+    columns = inspect(entity.__class__).column_attrs.keys()
+    if not entity.id:
+        entity.id = generate_id(entity.__tablename__)
+    return {
+        key: value
+        for key, value in entity.__dict__.items()
+        if key in columns
+    }
+
+
+def group_by_class(entities):
+    groups = {}
+    for entity in entities:
+        groups.setdefault(entity.__class__, []).append(entity)
+    return groups
+
+
+def batched(items, batch_size):
+    for i in range(0, len(items), batch_size):
+        yield items[i: i + batch_size]
+
+
+def has_delete_cascade(entity_class):
+    return any(
+        relationship.cascade.delete
+        for relationship in inspect(entity_class).relationships
+    )
 
 
 class CrudRepository:
@@ -13,27 +126,192 @@ class CrudRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def fetch_all(self, entity_class, offset=0, limit=10, clauses=None):
-        statement = select(entity_class)
-        if clauses is not None:
-            statement = statement.where(clauses)
+    @property
+    def unit_of_work(self) -> bool:
+        return self.db.info.get("unit_of_work", False)
 
-        # created_at desc로 정렬
-        if hasattr(entity_class, 'created_at'):
-            statement = statement.order_by(entity_class.created_at.desc())
+    async def commit(self):
+        """
+        unit of work 모드에서는 flush만 하고, commit은 요청 종료 시
+        get_db에서 한 번만 수행합니다.
+        """
+        if self.unit_of_work:
+            await self.db.flush()
+        else:
+            await self.db.commit()
 
-        result = await self.db.execute(statement.offset(offset).limit(limit))
+    async def fetch_all(
+        self,
+        entity_class,
+        offset=0,
+        limit=10,
+        clauses=None,
+        cursor=None,
+        profile=None,
+        projection=None,
+    ):
+        """
+        projection(response model)을 지정하면 entity 대신 응답에 필요한 컬럼만
+        조회하여 Row 목록을 반환합니다. (identity map, ORM 로딩 비용 없음)
+        Row는 속성으로 접근할 수 있으므로 from_attributes 응답 모델에 그대로
+        model_validate 할 수 있습니다.
+        """
+        statement, params = self._page_statement(
+            entity_class, offset, limit, clauses, cursor, profile, projection
+        )
+        result = await self.db.execute(statement, params)
+        if projection is not None:
+            return result.all()
         return result.unique().scalars().all()
 
-    async def find_by_id(self, entity_class, entity_id, field_name="id"):
-        field = getattr(entity_class, field_name, None)
-        if not field:
-            raise ModuleNotFoundError(
-                f"Field '{field_name}' not found in {entity_class.__name__}"
+    def _page_statement(
+        self,
+        entity_class,
+        offset,
+        limit,
+        clauses,
+        cursor,
+        profile,
+        projection=None,
+        with_total=False,
+    ):
+        """
+        조건(clauses)을 제외한 statement는 cached_statement로 재사용하고
+        offset, limit, cursor 값은 파라미터로 넘깁니다.
+        """
+        params = {"offset": offset, "limit": limit}
+        # created_at desc, id desc로 정렬 (동일 시각 row의 순서 고정)
+        ordered = hasattr(entity_class, "created_at")
+        # cursor가 있으면 offset 대신 (created_at, id) 기준으로 seek
+        seek = bool(cursor) and ordered
+        if seek:
+            created_at, entity_id = decode_cursor(cursor)
+            params.update(
+                offset=0, cursor_created_at=created_at, cursor_id=entity_id
+            )
+
+        def build():
+            if projection is None:
+                statement = select(entity_class).options(
+                    *loading_options(entity_class, profile)
+                )
+            else:
+                statement = select(
+                    *projected_columns(
+                        entity_class, projection, ("id", "created_at")
+                    )
+                )
+            if ordered:
+                statement = statement.order_by(
+                    entity_class.created_at.desc(), entity_class.id.desc()
+                )
+            if seek:
+                statement = statement.where(
+                    tuple_(entity_class.created_at, entity_class.id)
+                    < tuple_(
+                        bindparam(
+                            "cursor_created_at",
+                            type_=entity_class.created_at.type,
+                        ),
+                        bindparam("cursor_id", type_=entity_class.id.type),
+                    )
+                )
+            if with_total:
+                statement = statement.add_columns(
+                    func.count().over().label("total")
+                )
+            return statement.offset(bindparam("offset")).limit(
+                bindparam("limit")
+            )
+
+        statement = cached_statement(
+            ("page", entity_class, profile, projection, seek, with_total),
+            build,
+        )
+        if clauses is not None:
+            statement = statement.where(clauses)
+        return statement, params
+
+    async def fetch_page(
+        self,
+        entity_class,
+        offset=0,
+        limit=10,
+        clauses=None,
+        cursor=None,
+        profile=None,
+        projection=None,
+    ):
+        """
+        fetch_all 결과와 전체 개수, 다음 페이지 cursor를 함께 반환합니다.
+        - 조건이 있으면 total은 같은 쿼리의 COUNT(*) OVER ()로 구합니다.
+        - 조건이 없으면 테이블 전체에 window를 걸면 인덱스 순서로 LIMIT 만큼만
+          읽지 못하므로, 캐시된 근사값(table_count)을 사용합니다.
+        - cursor 페이지에서는 첫 페이지의 total을 cursor에서 꺼내 씁니다.
+        - offset이 범위를 넘어 row가 없으면 total은 None 입니다.
+        - 마지막 페이지이면 next_cursor는 None 입니다.
+        """
+        if cursor or clauses is None:
+            if cursor:
+                total = cursor_total(cursor)
+            else:
+                total = await self.table_count(entity_class)
+            entities = await self.fetch_all(
+                entity_class,
+                offset,
+                limit,
+                clauses,
+                cursor,
+                profile,
+                projection,
+            )
+        else:
+            statement, params = self._page_statement(
+                entity_class,
+                offset,
+                limit,
+                clauses,
+                cursor,
+                profile,
+                projection,
+                with_total=True,
             )
+            result = await self.db.execute(statement, params)
+            if projection is not None:
+                # Row에 total 컬럼이 더 있어도 응답 모델 검증에는 영향 없음
+                entities = rows = result.all()
+            else:
+                rows = result.unique().all()
+                entities = [row[0] for row in rows]
+            total = rows[0].total if rows else (None if offset else 0)
 
+        next_cursor = None
+        if entities and len(entities) == limit:
+            next_cursor = encode_cursor(entities[-1], total)
+        return entities, total, next_cursor
+
+    async def table_count(self, entity_class) -> int:
+        """
+        테이블 전체 row 수. COUNT_CACHE_SECONDS 동안 캐시한 근사값입니다.
+        """
+        now = time.monotonic()
+        cached = _table_counts.get(entity_class)
+        if cached and cached[0] > now:
+            return cached[1]
+        statement = cached_statement(
+            ("count", entity_class),
+            lambda: select(func.count()).select_from(entity_class),
+        )
+        count = (await self.db.execute(statement)).scalar_one()
+        _table_counts[entity_class] = (now + COUNT_CACHE_SECONDS, count)
+        return count
+
+    async def find_by_id(
+        self, entity_class, entity_id, field_name="id", profile=None
+    ):
+        field = get_field(entity_class, field_name)
         entity = await self.db.execute(
-            select(entity_class).where(field == entity_id)
+            select_by(entity_class, field, profile), {"value": entity_id}
         )
         entity = entity.unique().scalar_one_or_none()
         if not entity:
@@ -45,41 +323,185 @@ class CrudRepository:
 
     async def create(self, entity):
         self.db.add(entity)
-        await self.db.commit()
+        await self.commit()
         await self.db.refresh(entity)
         return entity
 
+    async def create_many(self, entities, batch_size=BULK_BATCH_SIZE):
+        """
+        entity 목록을 클래스별 executemany INSERT로 저장합니다.
+        batch_size 단위로 commit(unit of work 모드에서는 flush) 하며, 관계(relationship)는 저장하지 않습니다.
+        id는 python에서 생성하므로 refresh 없이 entity.id로 확인할 수 있습니다.
+        """
+        for entity_class, group in group_by_class(entities).items():
+            for batch in batched(group, batch_size):
+                await self.db.execute(
+                    insert(entity_class), [to_row(e) for e in batch]
+                )
+                await self.commit()
+        return [entity.id for entity in entities]
+
+    async def upsert_many(
+        self, entities, index_elements=("id",), batch_size=BULK_BATCH_SIZE
+    ):
+        """
+        index_elements가 충돌하면 나머지 컬럼을 갱신하는 bulk upsert 입니다.
+        (INSERT ... ON CONFLICT DO UPDATE ... RETURNING id)
+        ON CONFLICT를 지원하지 않는 DB는 기존 row를 조회한 뒤 UPDATE/INSERT 합니다.
+        저장된 row의 id를 입력 순서대로 반환합니다.
+        """
+        dialect = self.db.get_bind().dialect.name
+        dialect_insert = UPSERT_INSERT.get(dialect)
+
+        for entity_class, group in group_by_class(entities).items():
+            mapper = inspect(entity_class)
+            for batch in batched(group, batch_size):
+                if dialect_insert is None:
+                    await self._select_and_upsert(
+                        entity_class, batch, index_elements
+                    )
+                    await self.commit()
+                    continue
+                rows = [to_row(e) for e in batch]
+                statement = dialect_insert(entity_class)
+                update_columns = {
+                    mapper.column_attrs[key].columns[0].name
+                    for row in rows
+                    for key in row
+                } - set(index_elements) - UPSERT_KEEP_COLUMNS
+                statement = statement.on_conflict_do_update(
+                    index_elements=list(index_elements),
+                    set_={
+                        name: statement.excluded[name]
+                        for name in update_columns
+                    },
+                ).returning(entity_class.id, sort_by_parameter_order=True)
+                result = await self.db.execute(statement, rows)
+                # 충돌한 경우 기존 row의 id가 반환됨
+                for entity, entity_id in zip(batch, result.scalars().all()):
+                    entity.id = entity_id
+                await self.commit()
+        return [entity.id for entity in entities]
+
+    async def _select_and_upsert(self, entity_class, batch, index_elements):
+        """
+        index_elements로 기존 row의 id를 조회해 있으면 UPDATE, 없으면 INSERT
+        (같은 key를 동시에 넣는 요청이 있으면 unique 오류가 날 수 있음)
+        """
+        columns = [getattr(entity_class, key) for key in index_elements]
+        rows = [to_row(entity) for entity in batch]
+        keys = [tuple(row.get(key) for key in index_elements) for row in rows]
+        if len(columns) == 1:
+            condition = columns[0].in_([key[0] for key in keys])
+        else:
+            condition = tuple_(*columns).in_(keys)
+        result = await self.db.execute(
+            select(*columns, entity_class.id).where(condition)
+        )
+        ids = {tuple(row[:-1]): row[-1] for row in result}
+
+        inserts = {}  # key -> row (batch 안에서 같은 key는 마지막 값)
+        updates = {}  # id -> row
+        for entity, row, key in zip(batch, rows, keys):
+            entity_id = ids.get(key)
+            if entity_id is None and key in inserts:
+                inserts[key].update(
+                    {k: v for k, v in row.items() if k != "id"}
+                )
+                entity.id = inserts[key]["id"]
+            elif entity_id is None:
+                inserts[key] = row
+            else:
+                entity.id = entity_id
+                values = updates.setdefault(entity_id, {"id": entity_id})
+                values.update(
+                    {
+                        k: v
+                        for k, v in row.items()
+                        if k not in UPSERT_KEEP_COLUMNS
+                        and k not in index_elements
+                    }
+                )
+        updates = [values for values in updates.values() if len(values) > 1]
+        if updates:
+            # primary key 기준 bulk UPDATE (executemany)
+            await self.db.execute(update(entity_class), updates)
+        if inserts:
+            await self.db.execute(
+                insert(entity_class), list(inserts.values())
+            )
+
     async def update(self, entity, field_name="id"):
+        """
+        entity에 설정된 컬럼만 UPDATE ... RETURNING 한 번으로 수정합니다.
+        수정된 row가 없으면 404를 반환합니다.
+        """
+        entity_class = entity.__class__
+        field = get_field(entity_class, field_name)
         entity_id = getattr(entity, field_name, None)
-        existing_entity = await self.find_by_id(
-            entity.__class__, entity_id, field_name
-        )
 
-        for key, value in entity.__dict__.items():
-            if key != "_sa_instance_state":
-                setattr(existing_entity, key, value)
-        self.db.add(existing_entity)
-        await self.db.commit()
-        await self.db.refresh(existing_entity)
+        columns = inspect(entity_class).column_attrs.keys()
+        values = {
+            key: value
+            for key, value in entity.__dict__.items()
+            if key in columns and key not in (field_name, "id")
+        }
+        if not values:
+            return await self.find_by_id(entity_class, entity_id, field_name)
+
+        result = await self.db.execute(
+            update(entity_class)
+            .where(field == entity_id)
+            .values(**values)
+            .returning(entity_class)
+            .options(*returning_options(entity_class))
+        )
+        existing_entity = result.scalars().first()
+        if not existing_entity:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"entity({entity_class.__name__}) not found with {field_name}={entity_id}",
+            )
+        await self.commit()
         return existing_entity
 
     async def delete(self, entity, field_name="id"):
+        """
+        DELETE ... WHERE 한 번으로 삭제하고, 삭제된 row가 없으면 404를 반환합니다.
+        ORM cascade가 필요한 모델(예: Ideation)만 로딩 후 삭제합니다.
+        """
+        entity_class = entity.__class__
         entity_id = getattr(entity, field_name, None)
-        existing_entity = await self.find_by_id(
-            entity.__class__, entity_id, field_name
-        )
-        await self.db.delete(existing_entity)
-        await self.db.commit()
 
-    async def exists(self, entity_class, entity_id, field_name="id"):
-        field = getattr(entity_class, field_name, None)
-        if not field:
-            raise ModuleNotFoundError(
-                f"Field '{field_name}' not found in {entity_class.__name__}"
+        if has_delete_cascade(entity_class):
+            existing_entity = await self.find_by_id(
+                entity_class, entity_id, field_name
+            )
+            await self.db.delete(existing_entity)
+            await self.commit()
+            return
+
+        field = get_field(entity_class, field_name)
+        rowcount = await self.delete_all(entity_class, field == entity_id)
+        if rowcount == 0:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"entity({entity_class.__name__}) not found with {field_name}={entity_id}",
             )
 
+    async def delete_all(self, entity_class, clauses):
+        """
+        clauses에 해당하는 row를 한 번에 삭제하고 삭제된 row 수를 반환합니다.
+        ORM cascade는 적용되지 않습니다.
+        """
+        result = await self.db.execute(delete(entity_class).where(clauses))
+        await self.commit()
+        return result.rowcount
+
+    async def exists(self, entity_class, entity_id, field_name="id"):
+        field = get_field(entity_class, field_name)
         result = await self.db.execute(
-            select(1).where(field == entity_id).limit(1)
+            exists_by(entity_class, field), {"value": entity_id}
         )
         return result.scalar() is not None
 
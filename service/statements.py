@@ -0,0 +1,44 @@
+from sqlalchemy import bindparam, select
+
+from service.loading import loading_options
+
+# (용도, entity class, 필드, 로딩 프로필 ...) -> 미리 만들어 둔 statement
+# statement는 불변이고 cache key도 객체에 memoize 되므로, 같은 객체를 재사용하면
+# select() 구성과 cache key 계산을 매 호출마다 하지 않습니다.
+# 값은 bindparam으로 두고 execute 시 파라미터로 넘깁니다.
+_statements = {}
+
+
+def cached_statement(key, build):
+    statement = _statements.get(key)
+    if statement is None:
+        statement = _statements[key] = build()
+    return statement
+
+
+def select_by(entity_class, field, profile=None):
+    """
+    SELECT entity WHERE field = :value
+    """
+
+    def build():
+        return (
+            select(entity_class)
+            .options(*loading_options(entity_class, profile))
+            .where(field == bindparam("value"))
+        )
+
+    return cached_statement(
+        ("select_by", entity_class, field.key, profile), build
+    )
+
+
+def exists_by(entity_class, field):
+    """
+    SELECT 1 WHERE field = :value LIMIT 1
+    """
+
+    def build():
+        return select(1).where(field == bindparam("value")).limit(1)
+
+    return cached_statement(("exists_by", entity_class, field.key), build)
@@ -0,0 +1,170 @@
+import asyncio
+
+import casbin
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from auth import Principal
+from common.config import ROOT_PATH
+from common.policy_index import GROUP, PolicyIndex
+from common.role_links import MISSING
+from database import Base
+from model.attachment import Comment
+from model.ideation import Ideation
+from model.invest import Investor
+from model.user import User
+from service import authorization
+from service.authorization import can_write
+from utils.prune_policies import redundant_rule_ids
+
+
+@pytest.fixture
+def policy_index(monkeypatch):
+    policy_index = PolicyIndex(casbin.AsyncEnforcer(f"{ROOT_PATH}/model.conf"))
+    monkeypatch.setattr(authorization, "policy_index", policy_index)
+    return policy_index
+
+
+def principal(user: User, group_id=None) -> Principal:
+    # token의 group_id는 발급 당시 값
+    return Principal(
+        id=user.id,
+        name=user.name,
+        email=user.email,
+        role=user.role,
+        group_id=group_id or user.group_id,
+    )
+
+
+@pytest.mark.anyio
+class TestCanWrite:
+    async def test_owner_column(
+        self, async_session: AsyncSession, policy_index: PolicyIndex
+    ):
+        owner = User(id="user_owner", group_id="investor_owner")
+        other = User(id="user_other")
+        ideation = Ideation(id="ideation_owned", user_id=owner.id)
+        comment = Comment(
+            id="comment_owned",
+            related_id=ideation.id,
+            content="c",
+            user_id=owner.id,
+        )
+        investor = Investor(id="investor_owner")
+        async_session.add_all([owner, other, ideation, comment, investor])
+        await async_session.flush()
+        owner, other = principal(owner), principal(other)
+
+        db = async_session
+        assert await can_write(db, owner, Ideation, ideation.id)
+        assert await can_write(db, owner, Comment, comment.id)
+        assert await can_write(db, owner, Investor, investor.id)
+        assert not await can_write(db, other, Ideation, ideation.id)
+        assert not await can_write(db, other, Investor, investor.id)
+        assert not await can_write(db, owner, Ideation, "ideation_missing")
+        # 로딩된 entity가 있으면 그 값으로 판단
+        assert await can_write(db, owner, Ideation, ideation.id, ideation)
+        assert not await can_write(db, other, Ideation, ideation.id, ideation)
+
+    async def test_explicit_grant(
+        self, async_session: AsyncSession, policy_index: PolicyIndex
+    ):
+        other = User(id="user_granted")
+        ideation = Ideation(id="ideation_granted", user_id="user_owner")
+        async_session.add_all([other, ideation])
+        await async_session.flush()
+        other = principal(other)
+
+        assert not await can_write(async_session, other, Ideation, ideation.id)
+        await policy_index.add_policies([(other.id, ideation.id, "write")])
+        assert await can_write(async_session, other, Ideation, ideation.id)
+
+    async def test_group_grant(
+        self, async_session: AsyncSession, policy_index: PolicyIndex
+    ):
+        member = User(id="user_member", group_id="group_1")
+        outsider = User(id="user_outsider", group_id="group_2")
+        ideation = Ideation(id="ideation_group", user_id="user_owner")
+        async_session.add_all([member, outsider, ideation])
+        await async_session.flush()
+
+        # group 정책 하나로 group의 모든 사용자에게 권한
+        await policy_index.add_policies([("group_1", ideation.id, "write")])
+        assert await can_write(
+            async_session, principal(member), Ideation, ideation.id
+        )
+        assert not await can_write(
+            async_session, principal(outsider), Ideation, ideation.id
+        )
+
+        # 이전 group_id가 들어 있는 token으로는 그 group 권한을 받지 못함
+        stale = principal(outsider, group_id="group_1")
+        assert not await can_write(async_session, stale, Ideation, ideation.id)
+
+
+class RecordingWatcher:
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, op, rules):
+        self.published.append((op, rules))
+
+
+@pytest.fixture
+async def session():
+    # commit/rollback을 실제로 하는 별도 DB (async_session은 rollback 불가)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_group_change(session: AsyncSession, policy_index: PolicyIndex):
+    member = User(id="user_moved", group_id="group_1")
+    ideation = Ideation(id="ideation_moved", user_id="user_owner")
+    session.add_all([member, ideation])
+    await session.commit()
+    await policy_index.add_policies([("group_1", "ideation_moved", "write")])
+    policy_index.watcher = RecordingWatcher()
+    token = principal(member)
+    assert await can_write(session, token, Ideation, "ideation_moved")
+
+    # rollback한 변경은 캐시에 영향이 없고 남지도 않음
+    member.group_id = "group_2"
+    await session.flush()
+    await session.rollback()
+    assert "group_changed" not in session.info
+    assert policy_index.group("user_moved") == "group_1"
+
+    # group을 옮기면 commit 시 캐시를 지우고 전파 (get_db를 거치지 않아도)
+    member = await session.get(User, "user_moved")
+    member.group_id = "group_2"
+    await session.commit()
+    assert policy_index.group("user_moved") is MISSING
+    await asyncio.gather(*authorization._publish_tasks)
+    assert policy_index.watcher.published == [(GROUP, [("user_moved",)])]
+    assert not await can_write(session, token, Ideation, "ideation_moved")
+    assert policy_index.group("user_moved") == "group_2"
+
+
+@pytest.mark.anyio
+async def test_redundant_rule_ids(async_session: AsyncSession):
+    async_session.add_all(
+        [
+            Ideation(id="ideation_prune", user_id="user_owner"),
+            Investor(id="investor_prune"),
+        ]
+    )
+    await async_session.flush()
+
+    rules = [
+        (1, "user_owner", "ideation_prune"),  # 작성자 정책
+        (2, "user_other", "ideation_prune"),  # 명시적 권한
+        (3, "investor_prune", "investor_prune"),  # group 정책
+        (4, "user_owner", "attachment_1"),  # 소유자 컬럼 없음
+    ]
+    conn = await async_session.connection()
+    assert await redundant_rule_ids(conn, rules) == [1, 3]
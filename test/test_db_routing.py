@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from starlette.requests import Request
+
+from common.db_routing import (
+    ReadYourWrites,
+    RoutingSession,
+    db_route,
+    use_replica,
+)
+from database import Base
+from model.board import Board, BoardCategory
+
+
+@pytest.fixture
+async def engines(tmp_path):
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/primary.db")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/replica.db")
+    for engine in (primary, replica):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    yield primary, replica
+    await primary.dispose()
+    await replica.dispose()
+
+
+def make_request(method="GET", endpoint=None, token="Bearer a"):
+    return Request(
+        {
+            "type": "http",
+            "method": method,
+            "path": "/",
+            "headers": [(b"authorization", token.encode())],
+            "endpoint": endpoint,
+        }
+    )
+
+
+@pytest.mark.anyio
+async def test_reads_go_to_replica_and_writes_to_primary(engines):
+    primary, replica = engines
+    session = AsyncSession(
+        bind=primary,
+        sync_session_class=RoutingSession,
+        replicas=[replica],
+        info={"use_replica": True},
+    )
+    async with session:
+        session.add(
+            Board(
+                id="board_1",
+                category=BoardCategory.NOTICE,
+                title="t",
+                content="c",
+            )
+        )
+        await session.commit()
+        assert session.info["wrote"]
+
+        # replica에는 아직 복제되지 않음
+        result = await session.execute(select(Board))
+        assert result.scalars().all() == []
+
+        session.info["use_replica"] = False
+        result = await session.execute(select(Board))
+        assert [board.id for board in result.scalars()] == ["board_1"]
+
+
+def test_use_replica():
+    @db_route("primary")
+    async def endpoint():
+        pass
+
+    assert use_replica(make_request("GET"))
+    assert not use_replica(make_request("POST"))
+    assert not use_replica(make_request("GET", endpoint=endpoint))
+
+
+def test_read_your_writes(monkeypatch):
+    from common import db_routing
+
+    sticky = ReadYourWrites(seconds=60)
+    monkeypatch.setattr(db_routing, "read_your_writes", sticky)
+    sticky.mark(db_routing.client_key(make_request("POST")))
+
+    assert not use_replica(make_request("GET"))
+    assert use_replica(make_request("GET", token="Bearer b"))
@@ -0,0 +1,27 @@
+from datetime import datetime, timedelta, timezone
+
+from database import generate_id
+from utils.id_util import id_created_at, uuid7
+
+
+class TestIdUtil:
+    def test_uuid7_is_time_ordered(self):
+        ids = [generate_id("boards") for _ in range(10000)]
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+        assert uuid7().version == 7
+
+    def test_id_created_at(self):
+        entity_id = generate_id("chat_user")
+        created_at = id_created_at(entity_id)
+        assert entity_id.startswith("chat_user_")
+        assert abs(datetime.now(timezone.utc) - created_at) < timedelta(
+            seconds=1
+        )
+
+    def test_legacy_ids(self):
+        assert (
+            id_created_at("boards_3f1d7a9e-8a36-4d0e-9d0a-1c2f0e6a5b7c")
+            is None
+        )
+        assert id_created_at("ideation_1") is None
@@ -0,0 +1,91 @@
+import pytest
+from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from starlette.exceptions import HTTPException
+
+import model.user
+from auth import authenticate_user
+from database import Base
+from model.user import User
+from utils import auth
+
+
+@pytest.fixture
+def fast_context(monkeypatch):
+    context = CryptContext(
+        schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5
+    )
+    monkeypatch.setattr(auth, "pwd_context", context)
+    return context
+
+
+@pytest.mark.anyio
+async def test_check_password_rehashes_deprecated(fast_context):
+    user = User(id="user_1")
+    # 예전 설정(rounds 4)으로 만든 hash
+    user._password = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash(
+        "secret"
+    )
+
+    assert not await user.check_password("wrong")
+    assert user._password.startswith("$2b$04$")
+
+    assert await user.check_password("secret")
+    assert user._password.startswith("$2b$05$")
+    assert user.verify_password("secret")
+
+    # 이미 최신 hash면 바꾸지 않음
+    current = user._password
+    assert await user.check_password("secret")
+    assert user._password == current
+
+
+@pytest.mark.anyio
+async def test_set_password(fast_context):
+    user = User(id="user_1")
+    await user.set_password("secret")
+    assert fast_context.verify("secret", user._password)
+
+
+@pytest.mark.anyio
+async def test_queue_full(fast_context, monkeypatch):
+    monkeypatch.setattr(auth, "PASSWORD_HASH_QUEUE", 0)
+    with pytest.raises(HTTPException) as e:
+        await auth.hash_password("secret")
+    assert e.value.status_code == 503
+
+
+@pytest.mark.anyio
+async def test_authenticate_releases_connection(fast_context, monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        user = User(id="user_1", email="user@series0.com")
+        user._password = CryptContext(
+            schemes=["bcrypt"], bcrypt__rounds=4
+        ).hash("secret")
+        db.add(user)
+        await db.commit()
+
+    # bcrypt 실행 중에는 트랜잭션(= connection)을 잡고 있지 않아야 함
+    in_transaction = []
+    verify_and_update = model.user.verify_and_update
+
+    async def recording_verify_and_update(*args):
+        in_transaction.append(db.in_transaction())
+        return await verify_and_update(*args)
+
+    monkeypatch.setattr(
+        model.user, "verify_and_update", recording_verify_and_update
+    )
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        assert await authenticate_user("user@series0.com", "secret", db)
+        assert in_transaction == [False]
+        assert not db.in_transaction()
+
+    # rehash는 저장됨
+    async with AsyncSession(engine) as db:
+        user = await db.get(User, "user_1")
+        assert user._password.startswith("$2b$05$")
+    await engine.dispose()
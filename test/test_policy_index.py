@@ -0,0 +1,175 @@
+import casbin
+import pytest
+from casbin_async_sqlalchemy_adapter import Adapter
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from common.config import ROOT_PATH
+from common.policy_index import FilteredPolicyIndex, PolicyIndex
+from common.role_links import MISSING, RoleLinks
+
+
+@pytest.fixture
+def policy_index():
+    enforcer = casbin.AsyncEnforcer(f"{ROOT_PATH}/model.conf")
+    return PolicyIndex(enforcer)
+
+
+@pytest.mark.anyio
+async def test_enforce_matches_casbin(policy_index: PolicyIndex):
+    enforcer = policy_index.enforcer
+    await policy_index.add_policies(
+        [("user_1", "ideation_1", "write"), ("group_1", "investor_1", "write")]
+    )
+
+    requests = [
+        ("user_1", "ideation_1", "write"),
+        ("user_1", "ideation_2", "write"),
+        ("user_2", "ideation_1", "write"),
+        ("group_1", "investor_1", "write"),
+        ("admin", "anything", "write"),
+    ]
+    for request in requests:
+        assert policy_index.enforce(*request) == enforcer.enforce(*request)
+
+
+@pytest.mark.anyio
+async def test_group_links_match_casbin(policy_index: PolicyIndex):
+    enforcer = policy_index.enforcer
+    await policy_index.add_policies([("group_1", "investment_1", "write")])
+    # user_1 -> group_1 -> group_root, user_2는 group 없음
+    await enforcer.add_grouping_policy("group_1", "group_root")
+    policy_index.load()
+    policy_index.set_group("user_1", "group_1")
+    enforcer.get_role_manager().add_link("user_1", "group_1")
+    await policy_index.add_policies([("group_root", "ideation_1", "write")])
+
+    requests = [
+        ("user_1", "investment_1", "write"),
+        ("user_1", "ideation_1", "write"),  # 상위 group의 정책
+        ("user_2", "investment_1", "write"),
+        ("group_1", "ideation_1", "write"),
+        ("group_root", "investment_1", "write"),
+    ]
+    for request in requests:
+        assert policy_index.enforce(*request) == enforcer.enforce(*request)
+    assert policy_index.links.roles("user_1") == {
+        "user_1",
+        "group_1",
+        "group_root",
+    }
+
+
+@pytest.mark.anyio
+async def test_incremental_update(policy_index: PolicyIndex):
+    rule = ("user_1", "comment_1", "write")
+    await policy_index.add_policies([rule])
+    assert policy_index.enforce(*rule)
+
+    await policy_index.remove_policies([rule])
+    assert not policy_index.enforce(*rule)
+
+    # enforcer에 직접 추가된 정책은 load로 반영
+    await policy_index.enforcer.add_policies([rule])
+    policy_index.load()
+    assert policy_index.enforce(*rule)
+    assert len(policy_index) == 1
+
+
+@pytest.fixture
+async def filtered_index():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    adapter = Adapter(engine)
+    await adapter.create_table()
+    enforcer = casbin.AsyncEnforcer(f"{ROOT_PATH}/model.conf", adapter)
+    yield FilteredPolicyIndex(enforcer, engine, max_subjects=2)
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_filtered_loads_subject_on_first_use(
+    filtered_index: FilteredPolicyIndex,
+):
+    adapter = filtered_index.enforcer.adapter
+    await adapter.add_policies(
+        "p",
+        "p",
+        [
+            ("user_1", "ideation_1", "write"),
+            ("user_2", "ideation_2", "write"),
+            ("user_3", "ideation_3", "write"),
+        ],
+    )
+    filtered_index.load()
+    assert len(filtered_index) == 0  # 시작 시 아무것도 읽지 않음
+
+    assert await filtered_index.authorize("user_1", "ideation_1", "write")
+    assert not await filtered_index.authorize("user_1", "ideation_2", "write")
+    assert await filtered_index.authorize("user_2", "ideation_2", "write")
+    assert await filtered_index.authorize("admin", "anything", "write")
+
+    # 최대 2 subject: 가장 오래 사용하지 않은 user_1이 빠짐
+    assert await filtered_index.authorize("user_3", "ideation_3", "write")
+    assert not filtered_index.enforce("user_1", "ideation_1", "write")
+    assert filtered_index.enforce("user_3", "ideation_3", "write")
+
+
+@pytest.mark.anyio
+async def test_filtered_add_remove_and_invalidate(
+    filtered_index: FilteredPolicyIndex,
+):
+    rule = ("user_1", "comment_1", "write")
+    assert not await filtered_index.authorize(*rule)
+
+    await filtered_index.add_policies([rule])
+    assert await filtered_index.authorize(*rule)
+
+    await filtered_index.remove_policies([rule])
+    assert not await filtered_index.authorize(*rule)
+
+    # 다른 worker가 저장한 정책은 invalidate 후 다시 읽음
+    await filtered_index.enforcer.adapter.add_policy("p", "p", rule)
+    assert not await filtered_index.authorize(*rule)
+    filtered_index.invalidate("user_1")
+    assert await filtered_index.authorize(*rule)
+
+
+@pytest.mark.anyio
+async def test_filtered_group_policies(filtered_index: FilteredPolicyIndex):
+    adapter = filtered_index.enforcer.adapter
+    await adapter.add_policies(
+        "p", "p", [("group_root", "ideation_1", "write")]
+    )
+    await adapter.add_policy("g", "g", ("group_1", "group_root"))
+    filtered_index.set_group("user_1", "group_1")
+
+    # g 정책은 처음 사용할 때 읽음
+    assert await filtered_index.authorize("user_1", "ideation_1", "write")
+    assert not await filtered_index.authorize("user_2", "ideation_1", "write")
+
+    # g 정책 캐시가 넘쳐 다시 읽어도 user의 group은 유지
+    for sub in ("user_3", "user_4", "user_5"):
+        await filtered_index.authorize(sub, "ideation_1", "write")
+    assert await filtered_index.authorize("user_1", "ideation_1", "write")
+    # group을 직접 넘기면 캐시와 무관하게 적용
+    filtered_index.links.forget_groups(["user_1"])
+    assert await filtered_index.authorize(
+        "user_1", "ideation_1", "write", "group_1"
+    )
+
+
+def test_group_cache_is_bounded():
+    links = RoleLinks(max_subjects=2)
+    links.set_group("user_1", "group_1")
+    links.set_group("user_1", "group_2")  # 이전 group은 대체
+    assert links.roles("user_1") == {"user_1", "group_2"}
+    links.set_group("user_2", None)
+    links.set_group("user_3", "group_3")
+    assert links.group("user_1") is MISSING
+    assert links.group("user_2") is None
+    assert links.group("user_3") == "group_3"
+
+    # 읽는 도중 group이 바뀌면 읽은 값은 캐시하지 않음
+    version = links.group_version
+    links.forget_groups(["user_3"])
+    links.set_group("user_3", "group_old", version)
+    assert links.group("user_3") is MISSING
@@ -0,0 +1,115 @@
+import asyncio
+
+import casbin
+import pytest
+from casbin_async_sqlalchemy_adapter import Adapter
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from common.config import ROOT_PATH
+from common.policy_index import FilteredPolicyIndex, PolicyIndex
+from common.policy_watcher import LocalBus, PolicyWatcher
+from common.policy_writer import PolicyWriter
+from common.role_links import MISSING
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    await Adapter(engine).create_table()
+    yield engine
+    await engine.dispose()
+
+
+async def start_worker(bus, engine, index_class=PolicyIndex, **kwargs):
+    """
+    같은 DB와 bus를 사용하는 worker 하나의 policy_index
+    """
+    adapter = Adapter(engine)
+    enforcer = casbin.AsyncEnforcer(f"{ROOT_PATH}/model.conf", adapter)
+    watcher = PolicyWatcher(bus)
+    if index_class is FilteredPolicyIndex:
+        kwargs["engine"] = engine
+    policy_index = index_class(enforcer, watcher=watcher, **kwargs)
+    await watcher.start(policy_index.apply)
+    return policy_index
+
+
+async def wait_for(predicate):
+    for _ in range(100):
+        if await predicate():
+            return True
+        await asyncio.sleep(0.001)
+    return False
+
+
+@pytest.mark.anyio
+async def test_delta_reaches_other_workers(engine):
+    bus = LocalBus()
+    worker_1 = await start_worker(bus, engine)
+    worker_2 = await start_worker(bus, engine)
+    rule = ("user_1", "ideation_1", "write")
+
+    await worker_1.add_policies([rule])
+    assert await wait_for(lambda: worker_2.authorize(*rule))
+    assert worker_2.enforcer.enforce(*rule)
+
+    await worker_1.remove_policies([rule])
+    assert await wait_for(lambda: _negate(worker_2.authorize(*rule)))
+
+    await worker_1.watcher.stop()
+    await worker_2.watcher.stop()
+
+
+@pytest.mark.anyio
+async def test_filtered_worker_updates_cached_subject(engine):
+    bus = LocalBus()
+    worker_1 = await start_worker(bus, engine)
+    worker_2 = await start_worker(bus, engine, FilteredPolicyIndex)
+    rule = ("user_1", "comment_1", "write")
+
+    # worker_2가 user_1 정책을 캐시한 뒤 worker_1에서 권한 부여
+    assert not await worker_2.authorize(*rule)
+    await worker_1.add_policies([rule])
+    assert await wait_for(lambda: worker_2.authorize(*rule))
+    await worker_1.watcher.stop()
+    await worker_2.watcher.stop()
+
+
+@pytest.mark.anyio
+async def test_write_behind_publishes_after_flush(engine):
+    bus = LocalBus()
+    writer = PolicyWriter(Adapter(engine), interval=60)
+    worker_1 = await start_worker(bus, engine, writer=writer)
+    worker_1.enforcer.enable_auto_save(False)
+    worker_2 = await start_worker(bus, engine, FilteredPolicyIndex)
+    rule = ("group_1", "investment_1", "write")
+
+    await worker_1.add_policies([rule])
+    await asyncio.sleep(0.01)
+    assert not await worker_2.authorize(*rule)  # 아직 저장 전
+
+    await writer.flush()
+    assert await wait_for(lambda: worker_2.authorize(*rule))
+    await worker_1.watcher.stop()
+    await worker_2.watcher.stop()
+
+
+@pytest.mark.anyio
+async def test_group_change_reaches_other_workers(engine):
+    bus = LocalBus()
+    worker_1 = await start_worker(bus, engine)
+    worker_2 = await start_worker(bus, engine, FilteredPolicyIndex)
+    worker_2.set_group("user_1", "group_1")
+
+    await worker_1.group_changed(["user_1"])
+
+    async def forgotten():
+        return worker_2.group("user_1") is MISSING
+
+    assert await wait_for(forgotten)
+    await worker_1.watcher.stop()
+    await worker_2.watcher.stop()
+
+
+async def _negate(awaitable):
+    return not await awaitable
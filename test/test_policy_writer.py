@@ -0,0 +1,90 @@
+import casbin
+import pytest
+from casbin_async_sqlalchemy_adapter import Adapter
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from common.config import ROOT_PATH
+from common.policy_index import FilteredPolicyIndex, PolicyIndex
+from common.policy_writer import PolicyWriter
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def adapter(engine):
+    adapter = Adapter(engine)
+    await adapter.create_table()
+    return adapter
+
+
+async def stored_rules(adapter: Adapter) -> list:
+    enforcer = casbin.AsyncEnforcer(f"{ROOT_PATH}/model.conf", adapter)
+    await enforcer.load_policy()
+    return sorted(tuple(rule) for rule in enforcer.get_policy())
+
+
+@pytest.mark.anyio
+async def test_write_behind(adapter: Adapter):
+    writer = PolicyWriter(adapter, interval=60)
+    enforcer = casbin.AsyncEnforcer(f"{ROOT_PATH}/model.conf", adapter)
+    enforcer.enable_auto_save(False)
+    policy_index = PolicyIndex(enforcer, writer=writer)
+
+    rule = ("user_1", "ideation_1", "write")
+    other = ("user_1", "ideation_2", "write")
+    await policy_index.add_policies([rule, other])
+    await policy_index.remove_policies([other])
+
+    # 메모리에는 바로 반영되고 DB에는 아직 저장되지 않음
+    assert policy_index.enforce(*rule)
+    assert not policy_index.enforce(*other)
+    assert await stored_rules(adapter) == []
+
+    # 추가 후 삭제 순서대로 저장
+    assert await writer.flush() == 3
+    assert len(writer) == 0
+    assert await stored_rules(adapter) == [rule]
+
+
+@pytest.mark.anyio
+async def test_failed_flush_keeps_rules(adapter: Adapter, monkeypatch):
+    writer = PolicyWriter(adapter, interval=60)
+    rule = ("user_1", "comment_1", "write")
+    writer.add([rule])
+
+    async def fail(*args):
+        raise ConnectionError("db down")
+
+    with monkeypatch.context() as m:
+        m.setattr(adapter, "add_policies", fail)
+        with pytest.raises(ConnectionError):
+            await writer.flush()
+    assert writer.pending("user_1") == [("add", rule)]
+
+    # 종료 시 남은 정책을 저장
+    writer.start()
+    await writer.stop()
+    assert len(writer) == 0
+    assert await stored_rules(adapter) == [rule]
+
+
+@pytest.mark.anyio
+async def test_filtered_index_sees_pending(engine, adapter: Adapter):
+    writer = PolicyWriter(adapter, interval=60)
+    enforcer = casbin.AsyncEnforcer(f"{ROOT_PATH}/model.conf", adapter)
+    policy_index = FilteredPolicyIndex(enforcer, engine, writer=writer)
+
+    rule = ("user_1", "investment_1", "write")
+    await policy_index.add_policies([rule])
+    policy_index.invalidate()
+
+    # 저장 전에 subject를 처음 읽어도 대기 중인 정책이 반영됨
+    assert await policy_index.authorize(*rule)
+    await writer.flush()
+    policy_index.invalidate()
+    assert await policy_index.authorize(*rule)
@@ -0,0 +1,51 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from auth import Principal
+from common.pool import MeteredQueuePool, engine_options, pool_status, warm_up
+from model.user import RoleEnum
+
+
+def test_engine_options():
+    assert engine_options("sqlite+aiosqlite:///:memory:") == {}
+    options = engine_options("sqlite+aiosqlite:///./test.db", pool_size=2)
+    assert options["poolclass"] is MeteredQueuePool
+    assert options["pool_size"] == 2
+
+
+@pytest.mark.anyio
+async def test_warm_up_and_pool_status(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path}/pool.db"
+    engine = create_async_engine(url, **engine_options(url, pool_size=3))
+
+    await warm_up(engine)
+    status = pool_status(engine)
+    assert status["checked_in"] == 3
+    assert status["checked_out"] == 0
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        status = pool_status(engine)
+        assert status["checked_out"] == 1
+        assert status["overflow"] == 0
+    assert pool_status(engine)["checkouts"] == 4
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_db_health_requires_admin():
+    from main import get_db_health
+
+    user = Principal(
+        id="user_1", name="n", email="e", role=RoleEnum.INVESTOR.value
+    )
+    with pytest.raises(HTTPException) as e:
+        await get_db_health(user)
+    assert e.value.status_code == 403
+
+    admin = Principal(
+        id="user_2", name="n", email="e", role=RoleEnum.ADMIN.value
+    )
+    assert "primary" in await get_db_health(admin)
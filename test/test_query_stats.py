@@ -0,0 +1,104 @@
+import logging
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.query_stats import instrument, track_queries, uninstrument
+from model.board import Board
+
+
+@pytest.fixture
+def instrumented(async_session: AsyncSession):
+    connection = async_session.bind.sync_connection
+    instrument(connection)
+    yield async_session
+    uninstrument(connection)
+
+
+@pytest.mark.anyio
+class TestQueryStats:
+    async def test_count_queries(self, instrumented: AsyncSession):
+        with track_queries("GET /boards") as stats:
+            await instrumented.execute(select(Board))
+            await instrumented.execute(select(Board).where(Board.id == "1"))
+
+        assert stats.count == 2
+        assert stats.total_time > 0
+        assert stats.server_timing().endswith('desc="2 queries"')
+
+    async def test_warn_repeated_queries(
+        self, instrumented: AsyncSession, caplog
+    ):
+        with caplog.at_level(logging.WARNING, logger="common.query_stats"):
+            with track_queries("GET /comment/1") as stats:
+                for i in range(10):
+                    await instrumented.execute(
+                        select(Board).where(Board.id == str(i))
+                    )
+
+        assert stats.count == 10
+        assert len(stats.shapes) == 1
+        assert "possible N+1 in GET /comment/1 (10 times)" in caplog.text
+
+    async def test_failed_query_is_cleared(self, instrumented: AsyncSession):
+        from sqlalchemy import text
+        from sqlalchemy.exc import OperationalError
+
+        with pytest.raises(OperationalError):
+            await instrumented.execute(text("SELECT * FROM missing"))
+        connection = instrumented.bind.sync_connection
+        assert connection.info["query_start_time"] == {}
+
+
+@pytest.mark.anyio
+async def test_slow_query_log_captures_plan(tmp_path):
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from common.slow_query import SlowQueryLog
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/slow.db")
+    slow_query_log = SlowQueryLog(engine, threshold_ms=0)
+    slow_query_log.install()
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE t (id TEXT, related_id TEXT)"))
+        with track_queries("GET /comment/1"):
+            await conn.execute(
+                text("SELECT id FROM t WHERE related_id = :id"), {"id": "1"}
+            )
+    await slow_query_log.drain()
+    slow_query_log.uninstall()
+    await engine.dispose()
+
+    record = slow_query_log.recent[-1]
+    assert record["route"] == "GET /comment/1"
+    assert record["parameters"] == ("1",)
+    assert "SCAN t" in record["plan"][0][-1]
+
+
+@pytest.mark.anyio
+async def test_slow_query_log_failed_query(tmp_path):
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from common.slow_query import SlowQueryLog
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/slow.db")
+    slow_query_log = SlowQueryLog(engine, threshold_ms=0, explain=False)
+    slow_query_log.install()
+    async with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            await conn.execute(text("SELECT * FROM missing"))
+        await conn.rollback()
+        # 실패한 쿼리의 시작 시각이 남지 않아 다음 쿼리 시간이 정확함
+        await conn.execute(text("SELECT 1"))
+        connection = await conn.get_raw_connection()
+        # 시작 시각은 query_stats 한 곳에만 기록
+        assert connection.info["query_start_time"] == {}
+        assert "slow_query_start" not in connection.info
+    slow_query_log.uninstall()
+    await engine.dispose()
+
+    assert slow_query_log.recent[-1]["statement"] == "SELECT 1"
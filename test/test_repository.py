@@ -0,0 +1,292 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from model.board import Board, BoardCategory
+from service.repository import CrudRepository
+
+
+async def create_boards(async_session: AsyncSession, count: int):
+    base = datetime(2024, 1, 1)
+    boards = [
+        Board(
+            category=BoardCategory.NOTICE,
+            title=f"title {i}",
+            content=f"content {i}",
+            created_at=base + timedelta(minutes=i // 2),  # 동일 시각 포함
+        )
+        for i in range(count)
+    ]
+    async_session.add_all(boards)
+    await async_session.flush()
+    return boards
+
+
+@pytest.fixture(autouse=True)
+def clear_table_counts():
+    from service import repository
+
+    repository._table_counts.clear()
+
+
+@pytest.mark.anyio
+class TestCrudRepository:
+    async def test_fetch_page_with_cursor(self, async_session: AsyncSession):
+        await create_boards(async_session, 25)
+        repo = CrudRepository(async_session)
+
+        offset_titles = [
+            b.title for b in await repo.fetch_all(Board, 0, 100)
+        ]
+
+        cursor_titles = []
+        totals = []
+        cursor = None
+        while True:
+            boards, total, cursor = await repo.fetch_page(
+                Board, limit=10, cursor=cursor
+            )
+            cursor_titles += [b.title for b in boards]
+            totals.append(total)
+            if not cursor:
+                break
+
+        assert len(cursor_titles) == 25
+        assert cursor_titles == offset_titles
+        assert totals == [25, 25, 25]
+
+    async def test_fetch_page_total_in_same_statement(
+        self, async_session: AsyncSession
+    ):
+        from sqlalchemy import event
+
+        await create_boards(async_session, 5)
+        repo = CrudRepository(async_session)
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        connection = async_session.bind.sync_connection
+        event.listen(connection, "before_cursor_execute", capture)
+        boards, total, next_cursor = await repo.fetch_page(
+            Board, 2, 2, Board.category == BoardCategory.NOTICE
+        )
+        event.remove(connection, "before_cursor_execute", capture)
+
+        assert len(boards) == 2
+        assert total == 5
+        assert len(statements) == 1
+        assert "OVER ()" in statements[0]
+
+        _, total, _ = await repo.fetch_page(
+            Board, 10, 2, Board.category == BoardCategory.NOTICE
+        )
+        assert total is None
+
+    async def test_find_by_id_reuses_statement(
+        self, async_session: AsyncSession
+    ):
+        from service.statements import select_by
+
+        boards = await create_boards(async_session, 2)
+        repo = CrudRepository(async_session)
+
+        for board in boards:
+            found = await repo.find_by_id(Board, board.id)
+            assert found.id == board.id
+        assert select_by(Board, Board.id) is select_by(Board, Board.id)
+
+    async def test_fetch_page_projection(self, async_session: AsyncSession):
+        from sqlalchemy.engine import Row
+
+        from schema.board import BoardResponse
+
+        boards = await create_boards(async_session, 3)
+        repo = CrudRepository(async_session)
+
+        rows, total, next_cursor = await repo.fetch_page(
+            Board,
+            limit=2,
+            clauses=Board.category == BoardCategory.NOTICE,
+            projection=BoardResponse,
+        )
+        assert total == 3
+        assert all(isinstance(row, Row) for row in rows)
+        assert "created_by" not in rows[0]._fields
+        responses = [BoardResponse.model_validate(row) for row in rows]
+        assert [r.id for r in responses] == [b.id for b in boards[::-1][:2]]
+
+        rows, _, _ = await repo.fetch_page(
+            Board, cursor=next_cursor, projection=BoardResponse
+        )
+        assert [row.id for row in rows] == [boards[0].id]
+
+    async def test_fetch_page_cached_table_count(
+        self, async_session: AsyncSession
+    ):
+        await create_boards(async_session, 3)
+        repo = CrudRepository(async_session)
+
+        _, total, _ = await repo.fetch_page(Board)
+        assert total == 3
+
+        # 캐시 시간 동안은 새 row가 반영되지 않음 (근사값)
+        await create_boards(async_session, 1)
+        _, total, _ = await repo.fetch_page(Board)
+        assert total == 3
+
+    async def test_fetch_page_invalid_cursor(
+        self, async_session: AsyncSession
+    ):
+        from starlette.exceptions import HTTPException
+
+        repo = CrudRepository(async_session)
+        with pytest.raises(HTTPException) as e:
+            await repo.fetch_page(Board, cursor="not-a-cursor")
+        assert e.value.status_code == 400
+
+    async def test_find_by_id_with_loading_profile(
+        self, async_session: AsyncSession
+    ):
+        from model.ideation import Ideation
+        from service.loading import loaded_attributes
+
+        ideation = Ideation(title="Test Idea", content="This is a test idea.")
+        async_session.add(ideation)
+        await async_session.flush()
+        async_session.expunge_all()
+
+        repo = CrudRepository(async_session)
+        card = await repo.find_by_id(Ideation, ideation.id, profile="card")
+        props = loaded_attributes(card)
+        assert props["images"] == []
+        assert "comments" not in props
+        assert "attachments" not in props
+
+        with pytest.raises(ValueError):
+            await repo.find_by_id(Ideation, ideation.id, profile="unknown")
+
+    async def test_update_returning(self, async_session: AsyncSession):
+        from starlette.exceptions import HTTPException
+
+        board = (await create_boards(async_session, 1))[0]
+        repo = CrudRepository(async_session)
+
+        updated = await repo.update(Board(id=board.id, title="updated"))
+        assert updated.title == "updated"
+        assert updated.content == "content 0"  # 설정하지 않은 필드는 유지
+
+        with pytest.raises(HTTPException) as e:
+            await repo.update(Board(id="board_missing", title="updated"))
+        assert e.value.status_code == 404
+
+    async def test_delete(self, async_session: AsyncSession):
+        from starlette.exceptions import HTTPException
+
+        boards = await create_boards(async_session, 3)
+        repo = CrudRepository(async_session)
+
+        await repo.delete(Board(id=boards[0].id))
+        assert not await repo.exists(Board, boards[0].id)
+
+        with pytest.raises(HTTPException) as e:
+            await repo.delete(Board(id=boards[0].id))
+        assert e.value.status_code == 404
+
+        rowcount = await repo.delete_all(
+            Board, Board.id.in_([b.id for b in boards[1:]])
+        )
+        assert rowcount == 2
+
+    async def test_create_many_and_upsert_many(
+        self, async_session: AsyncSession
+    ):
+        from model.user import User
+
+        repo = CrudRepository(async_session)
+        boards = [
+            Board(category=BoardCategory.EVENT, title=f"t{i}", content="c")
+            for i in range(5)
+        ]
+        ids = await repo.create_many(boards, batch_size=2)
+        assert len(set(ids)) == 5
+        assert all(i.startswith("boards_") for i in ids)
+        assert len(await repo.fetch_all(Board, limit=100)) == 5
+
+        users = [
+            User(name="old", email="upsert@test.com"),
+            User(name="other", email="other@test.com"),
+        ]
+        created_ids = await repo.upsert_many(users, index_elements=["email"])
+        upserted_ids = await repo.upsert_many(
+            [User(name="new", email="upsert@test.com")],
+            index_elements=["email"],
+        )
+        assert upserted_ids == created_ids[:1]
+        async_session.expunge_all()
+        user = await repo.find_by_id(User, created_ids[0])
+        assert user.name == "new"
+
+    async def test_upsert_many_without_on_conflict(
+        self, async_session: AsyncSession, monkeypatch
+    ):
+        from model.user import User
+        from service import repository
+
+        # ON CONFLICT를 지원하지 않는 dialect와 같은 경로
+        monkeypatch.setattr(repository, "UPSERT_INSERT", {})
+        repo = CrudRepository(async_session)
+        created_ids = await repo.upsert_many(
+            [
+                User(name="old", email="fallback@test.com"),
+                User(name="other", email="fallback2@test.com"),
+            ],
+            index_elements=["email"],
+        )
+        upserted_ids = await repo.upsert_many(
+            [
+                User(name="new", email="fallback@test.com"),
+                User(name="third", email="fallback3@test.com"),
+                User(name="third2", email="fallback3@test.com"),
+            ],
+            index_elements=["email"],
+        )
+        assert upserted_ids[0] == created_ids[0]
+        assert upserted_ids[1] == upserted_ids[2]
+        async_session.expunge_all()
+        assert (await repo.find_by_id(User, created_ids[0])).name == "new"
+        assert (await repo.find_by_id(User, upserted_ids[2])).name == "third2"
+
+    async def test_unit_of_work_commits_once(
+        self, async_session: AsyncSession
+    ):
+        from sqlalchemy import event
+
+        commits = []
+        event.listen(
+            async_session.sync_session,
+            "after_commit",
+            lambda session: commits.append(session),
+        )
+
+        async def handle_request(repo: CrudRepository):
+            board = await repo.create(
+                Board(category=BoardCategory.NOTICE, title="t", content="c")
+            )
+            await repo.update(Board(id=board.id, title="updated"))
+            await repo.create_many(
+                [Board(category=BoardCategory.EVENT, title="t", content="c")]
+            )
+            await repo.delete(Board(id=board.id))
+
+        await handle_request(CrudRepository(async_session))
+        assert len(commits) == 4
+
+        commits.clear()
+        async_session.info["unit_of_work"] = True
+        await handle_request(CrudRepository(async_session))
+        assert commits == []
+        await async_session.commit()  # get_db의 요청 종료 commit
+        assert len(commits) == 1
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from common.sqlite_profile import create_sqlite_engines, is_file_sqlite
+
+
+@pytest.fixture
+async def engines(tmp_path):
+    writer, reader = create_sqlite_engines(
+        f"sqlite+aiosqlite:///{tmp_path}/profile.db"
+    )
+    async with writer.begin() as conn:
+        await conn.execute(text("CREATE TABLE t (id INTEGER)"))
+    yield writer, reader
+    await writer.dispose()
+    await reader.dispose()
+
+
+def test_is_file_sqlite():
+    assert is_file_sqlite("sqlite+aiosqlite:///./test.db")
+    assert not is_file_sqlite("sqlite+aiosqlite:///:memory:")
+    assert not is_file_sqlite("postgresql+asyncpg://localhost/db")
+
+
+async def pragma(conn, name):
+    return (await conn.exec_driver_sql(f"PRAGMA {name}")).scalar()
+
+
+@pytest.mark.anyio
+async def test_pragmas(engines):
+    writer, reader = engines
+    async with writer.connect() as conn:
+        assert await pragma(conn, "journal_mode") == "wal"
+        assert await pragma(conn, "synchronous") == 1
+        assert await pragma(conn, "busy_timeout") == 5000
+    async with reader.connect() as conn:
+        with pytest.raises(OperationalError):
+            await conn.execute(text("INSERT INTO t VALUES (1)"))
+
+
+@pytest.mark.anyio
+async def test_writes_are_serialized_while_reads_run(engines):
+    writer, reader = engines
+
+    async def write(i):
+        async with writer.begin() as conn:
+            await conn.execute(text("INSERT INTO t VALUES (:i)"), {"i": i})
+            await asyncio.sleep(0.01)
+
+    async def read():
+        async with reader.connect() as conn:
+            return (
+                await conn.execute(text("SELECT count(*) FROM t"))
+            ).scalar()
+
+    results = await asyncio.gather(
+        *[write(i) for i in range(20)], *[read() for _ in range(10)]
+    )
+
+    assert all(0 <= count <= 20 for count in results[20:])
+    assert await read() == 20
+
+
+def test_casbin_writes_use_the_writer():
+    import database
+
+    # casbin 정책 저장이 writer pool 밖에서 같은 파일에 쓰지 않음
+    assert database.casbin_engine is database.async_engine
+    assert database.adapter._engine is database.async_engine
+    assert database.casbin_reader is database.replica_engines[0]
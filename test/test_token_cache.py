@@ -0,0 +1,53 @@
+import time
+from datetime import timedelta
+
+import pytest
+
+import auth
+from common.token_cache import TokenCache
+from schema.token import UserToken
+
+
+def test_lru_and_expiry():
+    cache = TokenCache(maxsize=2)
+    now = time.time()
+    cache.put("token_1", now + 60, "user_1")
+    cache.put("token_2", now + 60, "user_2")
+    assert cache.get("token_1") == "user_1"  # token_1을 최근 사용으로
+    cache.put("token_3", now + 60, "user_3")
+    assert len(cache) == 2
+    assert cache.get("token_2") is None
+    assert cache.get("token_1") == "user_1"
+
+    cache.put("token_4", now - 1, "user_4")
+    assert cache.get("token_4") is None
+    cache.put("token_5", None, "user_5")  # exp 없는 token은 캐시하지 않음
+    assert cache.get("token_5") is None
+
+
+@pytest.mark.anyio
+async def test_get_current_user_cached(monkeypatch):
+    monkeypatch.setattr(auth, "token_cache", TokenCache())
+    token = auth.create_access_token(
+        UserToken(
+            id="user_1",
+            name="name",
+            email="user@series0.com",
+            role="user",
+            group_id="group_1",
+        ),
+        timedelta(minutes=5),
+    )
+
+    principal = await auth.get_current_user(token)
+    assert principal.id == "user_1"
+    assert principal.group_id == "group_1"
+    with pytest.raises(AttributeError):
+        principal.id = "user_2"
+
+    # 두 번째 요청은 서명 검증 없이 같은 principal
+    def decode(*args, **kwargs):
+        raise AssertionError("decoded again")
+
+    monkeypatch.setattr(auth.jwt, "decode", decode)
+    assert await auth.get_current_user(token) is principal
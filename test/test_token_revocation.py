@@ -0,0 +1,118 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import auth
+from common.policy_watcher import LocalBus, PolicyWatcher
+from common.token_cache import TokenCache
+from common.token_denylist import REVOKE, TokenDenylist
+from database import Base
+from model.user import RevokedToken
+from schema.token import UserToken
+
+
+@pytest.fixture
+async def engine(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr(auth, "async_engine", engine)
+    monkeypatch.setattr(auth, "token_cache", TokenCache())
+    monkeypatch.setattr(auth, "token_denylist", TokenDenylist())
+    monkeypatch.setattr(auth, "token_watcher", None)
+    yield engine
+    await engine.dispose()
+
+
+def issue_token():
+    return auth.create_access_token(
+        UserToken(
+            id="user_1", name="name", email="user@series0.com", role="user"
+        ),
+        timedelta(minutes=5),
+    )
+
+
+def test_denylist_drops_expired():
+    denylist = TokenDenylist(prune_interval=0)
+    now = time.time()
+    denylist.add([("jti_1", now + 60), ("jti_2", now - 1)])
+    assert "jti_1" in denylist
+    assert "jti_2" not in denylist
+
+    denylist.apply(REVOKE, [("jti_3", now + 60)])
+    assert "jti_3" in denylist
+    denylist.prune(now + 120)
+    assert len(denylist) == 0
+
+
+@pytest.mark.anyio
+async def test_revoke_and_reload(engine):
+    token = issue_token()
+    other_token = issue_token()
+    # 캐시된 token도 폐기 후에는 거부
+    principal = await auth.get_current_user(token)
+    assert principal.jti is not None
+
+    async with AsyncSession(engine) as db:
+        await auth.revoke_token(db, principal)
+        await db.commit()
+
+    with pytest.raises(HTTPException) as e:
+        await auth.get_current_user(token)
+    assert e.value.status_code == 401
+    assert (await auth.get_current_user(other_token)).id == "user_1"
+
+    # 다른 worker에서 같은 token으로 다시 로그아웃해도 오류 없음
+    async with AsyncSession(engine) as db:
+        await auth.revoke_token(db, principal)
+        await db.commit()
+
+    # 재시작: 만료된 row는 지우고 DB에서 denylist를 다시 만듦
+    async with AsyncSession(engine) as db:
+        db.add(RevokedToken(id="jti_expired", expires_at=int(time.time())))
+        await db.commit()
+    auth.token_denylist.load([])
+    await auth.load_revoked_tokens()
+    assert principal.jti in auth.token_denylist
+    assert len(auth.token_denylist) == 1
+    async with AsyncSession(engine) as db:
+        assert await db.get(RevokedToken, "jti_expired") is None
+
+
+@pytest.mark.anyio
+async def test_revoke_applies_after_commit(engine):
+    principal = await auth.get_current_user(issue_token())
+    async with AsyncSession(engine, info={"unit_of_work": True}) as db:
+        await auth.revoke_token(db, principal)
+        # commit 전에는 denylist에 추가하지 않음 (commit 실패 시 남지 않도록)
+        assert principal.jti not in auth.token_denylist
+        await db.commit()
+        for func, args in db.info.pop("after_commit"):
+            await func(*args)
+    assert principal.jti in auth.token_denylist
+
+
+@pytest.mark.anyio
+async def test_revoke_reaches_other_workers(engine, monkeypatch):
+    bus = LocalBus()
+    watcher_1 = PolicyWatcher(bus, channel="revoked")
+    watcher_2 = PolicyWatcher(bus, channel="revoked")
+    denylist_2 = TokenDenylist()
+    await watcher_2.start(denylist_2.apply)
+    monkeypatch.setattr(auth, "token_watcher", watcher_1)
+
+    principal = await auth.get_current_user(issue_token())
+    async with AsyncSession(engine) as db:
+        await auth.revoke_token(db, principal)
+        await db.commit()
+    for _ in range(100):
+        if principal.jti in denylist_2:
+            break
+        await asyncio.sleep(0.001)
+    assert principal.jti in denylist_2
+    await watcher_2.stop()
@@ -1,6 +1,29 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
+from starlette import status
+from starlette.exceptions import HTTPException
+
+# rounds를 올리면 기존 hash는 deprecated로 보고 로그인 시 다시 hash
+PASSWORD_BCRYPT_ROUNDS = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", 12))
+# bcrypt는 GIL을 놓으므로 thread pool에서 event loop와 병렬로 실행됨
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1)
+)
+# 실행 중 + 대기 중인 hash 작업의 최대 수 (넘으면 503)
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", 32))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=PASSWORD_BCRYPT_ROUNDS,
+)
+_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_in_flight = 0
 
 
 def verify_password(plain_password, hashed_password):
@@ -9,3 +32,36 @@ def verify_password(plain_password, hashed_password):
 
 def get_password_hash(password):
     return pwd_context.hash(password)
+
+
+async def _run_in_pool(func, *args):
+    """
+    bcrypt 작업을 전용 thread pool에서 실행합니다. (요청 처리 중에는 이 함수 사용)
+    대기열이 가득 차면 기다리지 않고 503을 반환합니다.
+    """
+    global _in_flight
+    if _in_flight >= PASSWORD_HASH_QUEUE:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many password requests",
+            headers={"Retry-After": "1"},
+        )
+    _in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, func, *args)
+    finally:
+        _in_flight -= 1
+
+
+async def hash_password(password) -> str:
+    return await _run_in_pool(pwd_context.hash, password)
+
+
+async def verify_and_update(plain_password, hashed_password):
+    """
+    (일치 여부, 새 hash) - hash가 deprecated가 아니면 새 hash는 None
+    """
+    return await _run_in_pool(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
@@ -0,0 +1,55 @@
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+    시간 순으로 정렬되는 UUIDv7 (RFC 9562)을 생성합니다.
+    - 상위 48bit: unix timestamp(ms)
+    - rand_a 12bit: 같은 ms 안에서 증가하는 counter
+    - rand_b 62bit: random
+    문자열로 비교해도 생성 순서가 유지되므로 B-tree 삽입이 뒤쪽에 몰립니다.
+    """
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:  # counter overflow 시 다음 ms로
+                _last_ms += 1
+                _counter = 0
+        unix_ms, counter = _last_ms, _counter
+
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (unix_ms & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76  # version
+    value |= counter << 64
+    value |= 0b10 << 62  # variant
+    value |= rand_b
+    return uuid.UUID(int=value)
+
+
+def id_created_at(entity_id: str) -> Optional[datetime]:
+    """
+    `{table}_{uuid7}` 형식의 id에서 생성 시각을 추출합니다.
+    uuid4 등 기존 형식의 id는 None을 반환합니다.
+    """
+    try:
+        value = uuid.UUID(entity_id[-36:])
+    except (ValueError, TypeError):
+        return None
+    if value.version != 7:
+        return None
+    unix_ms = value.int >> 80
+    return datetime.fromtimestamp(unix_ms / 1000, tz=timezone.utc)
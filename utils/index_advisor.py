@@ -0,0 +1,146 @@
+"""
+mock 데이터가 들어간 임시 DB에서 주요 API를 호출하고, 실행된 모든 쿼리를
+EXPLAIN QUERY PLAN으로 확인합니다. 인덱스 없이 테이블 전체를 읽는 쿼리가
+있으면 실패합니다.
+
+    python -m utils.index_advisor
+"""
+
+import asyncio
+import os
+import re
+import sys
+import tempfile
+
+from sqlalchemy import event
+
+SCAN = re.compile(r"^SCAN (\w+?)(_\d+)?( USING (COVERING )?INDEX \w+)?$")
+WHERE = re.compile(r"\bWHERE\b")
+
+# (method, path, body) - mock.py 데이터 기준
+REQUESTS = [
+    ("GET", "/themes", None),
+    ("GET", "/themes?theme_id=theme_1", None),
+    ("GET", "/ideation/themes", None),
+    ("GET", "/ideation/themes?theme_id=theme_1", None),
+    ("GET", "/ideation/user", None),
+    ("GET", "/ideation/ideation_1", None),
+    ("PUT", "/ideation/ideation_1?title=advisor&theme_id=theme_1", None),
+    ("GET", "/boards", None),
+    ("GET", "/boards?category=공지사항", None),
+    ("GET", "/board/board_1", None),
+    (
+        "PUT",
+        "/board/board_1",
+        {"category": "공지사항", "title": "t", "content": "c"},
+    ),
+    ("GET", "/investors", None),
+    ("GET", "/investor/investor_1", None),
+    ("GET", "/comment/ideation_1", None),
+    ("POST", "/comment", {"related_id": "ideation_1", "content": "advisor"}),
+    ("GET", "/finance/ideation_1", None),
+    ("POST", "/chat?to_user_id=user_2", None),
+    ("GET", "/chat", None),
+    ("DELETE", "/image/image_1", None),
+    ("DELETE", "/attachment/attachment_1", None),
+    ("DELETE", "/board/board_2", None),
+    ("DELETE", "/ideations/ideation_7", None),
+]
+
+
+def full_scans(statement, plan, tables):
+    """
+    실행 계획에서 테이블 전체를 읽는 실제 테이블 이름을 반환합니다.
+    - SCAN t: 항상 전체 scan
+    - SCAN t USING INDEX ix: 조건 없는 정렬 + LIMIT 인 경우만 허용
+    - 서브쿼리 결과를 읽는 SCAN은 제외
+    """
+    scans = []
+    for row in plan:
+        match = SCAN.match(row[-1])
+        if not match:
+            continue
+        table = match.group(1)
+        if table not in tables and match.group(2):
+            table += match.group(2)  # alias가 아니라 이름이 _1로 끝나는 테이블
+        if table not in tables:
+            continue
+        if match.group(3) and not WHERE.search(statement):
+            continue
+        scans.append(row[-1])
+    return scans
+
+
+async def advise():
+    import httpx
+
+    from database import Base, async_engine, init_db, replica_engines
+    from main import app
+    from mock import create_mock
+
+    statements = {}
+    engines = [async_engine.sync_engine] + [
+        engine.sync_engine for engine in replica_engines
+    ]
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        keyword = statement.lstrip().split(None, 1)[0].upper()
+        if not executemany and keyword in ("SELECT", "UPDATE", "DELETE"):
+            statements.setdefault(statement, parameters)
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", capture)
+    await init_db()
+    await create_mock()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://advisor"
+    ) as client:
+        response = await client.post(
+            "/login",
+            data={"username": "admin@series0.com", "password": "12341234"},
+        )
+        token = response.json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for method, path, body in REQUESTS:
+            response = await client.request(
+                method, path, json=body, headers=headers
+            )
+            if response.status_code >= 400:
+                print(f"{method} {path} -> {response.status_code}")
+
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    tables = set(Base.metadata.tables)
+    failures = []
+    async with async_engine.connect() as conn:
+        for statement, parameters in statements.items():
+            result = await conn.exec_driver_sql(
+                "EXPLAIN QUERY PLAN " + statement, parameters
+            )
+            scans = full_scans(statement, result.all(), tables)
+            if scans:
+                failures.append((scans, statement))
+    await async_engine.dispose()
+
+    print(f"checked {len(statements)} statements")
+    for scans, statement in failures:
+        print(f"\n{', '.join(scans)}:\n{statement}")
+    return not failures
+
+
+def main():
+    db_dir = tempfile.mkdtemp()
+    os.environ["SQLALCHEMY_DATABASE_URL"] = (
+        f"sqlite+aiosqlite:///{db_dir}/advisor.db"
+    )
+    os.chdir(db_dir)  # casbin adapter 등 상대 경로 파일도 임시 디렉토리에 생성
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+    ok = asyncio.run(advise())
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
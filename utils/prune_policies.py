@@ -0,0 +1,81 @@
+"""
+생성자 소유권만 다시 적어 둔 casbin 정책을 삭제합니다.
+(sub, obj, "write") 정책 중 obj row의 소유자 컬럼이 sub와 같은 정책은
+service.authorization의 소유자 확인으로 대체되므로 필요 없습니다.
+group 권한처럼 명시적으로 부여된 정책은 남깁니다.
+
+    python -m utils.prune_policies [--dry-run]
+"""
+
+import asyncio
+import sys
+
+from casbin_async_sqlalchemy_adapter import CasbinRule
+from sqlalchemy import delete, select
+
+from database import casbin_engine, casbin_reader
+from service.authorization import OWNER_COLUMNS
+
+BATCH_SIZE = 1000
+
+
+async def redundant_rule_ids(conn, rules) -> list:
+    """
+    rules: [(CasbinRule.id, sub, obj)]
+    """
+    pairs = {(sub, obj) for _, sub, obj in rules}
+    objs = list({obj for _, obj in pairs})
+    owned = set()
+    for entity_class, (column, _) in OWNER_COLUMNS.items():
+        result = await conn.execute(
+            select(getattr(entity_class, column), entity_class.id).where(
+                entity_class.id.in_(objs)
+            )
+        )
+        owned.update(tuple(row) for row in result)
+    return [rule_id for rule_id, sub, obj in rules if (sub, obj) in owned]
+
+
+async def prune(dry_run: bool = False) -> int:
+    pruned = 0
+    last_id = 0
+    # sqlite에서는 casbin_engine이 writer connection 하나이므로
+    # 읽기는 모두 reader에서 하고 삭제할 때만 writer를 잡음
+    async with casbin_reader.connect() as conn:
+        while True:
+            # id 순으로 나눠 읽어 정책 테이블 전체를 메모리에 올리지 않음
+            async with casbin_reader.connect() as casbin_conn:
+                result = await casbin_conn.execute(
+                    select(CasbinRule.id, CasbinRule.v0, CasbinRule.v1)
+                    .where(
+                        CasbinRule.id > last_id,
+                        CasbinRule.ptype == "p",
+                        CasbinRule.v2 == "write",
+                    )
+                    .order_by(CasbinRule.id)
+                    .limit(BATCH_SIZE)
+                )
+                rules = [tuple(row) for row in result]
+            if not rules:
+                break
+            last_id = rules[-1][0]
+
+            rule_ids = await redundant_rule_ids(conn, rules)
+            if rule_ids and not dry_run:
+                async with casbin_engine.begin() as casbin_conn:
+                    await casbin_conn.execute(
+                        delete(CasbinRule).where(CasbinRule.id.in_(rule_ids))
+                    )
+            pruned += len(rule_ids)
+    return pruned
+
+
+async def main():
+    dry_run = "--dry-run" in sys.argv
+    pruned = await prune(dry_run)
+    action = "would prune" if dry_run else "pruned"
+    print(f"{action} {pruned} owner policies")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())